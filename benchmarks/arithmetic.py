@@ -0,0 +1,51 @@
+"""Compares the exact arithmetic of ``pyracket.semantics.arithmetic`` with
+Python's ``int`` and ``fractions.Fraction``.
+
+Run with ``python -m benchmarks.arithmetic`` from the repository root.
+"""
+import timeit
+from fractions import Fraction
+
+from pyracket.semantics.arithmetic import add, div, integer, lt, mul
+from pyracket.semantics.numbers import Base, RkRational
+
+NUMBER = 200_000
+
+CASES = [
+    ("small int +", "a + b", "add(ra, rb)", 7, 35),
+    ("small int *", "a * b", "mul(ra, rb)", 7, 35),
+    ("small int <", "a < b", "lt(ra, rb)", 7, 35),
+    ("big int *", "a * b", "mul(ra, rb)", 3 ** 200, 7 ** 150),
+]
+
+RATIONAL_CASES = [
+    ("rational +", "fa + fb", "add(ra, rb)"),
+    ("rational *", "fa * fb", "mul(ra, rb)"),
+    ("rational /", "fa / fb", "div(ra, rb)"),
+    ("rational sum of 8", "fa + fb + fa + fb + fa + fb + fa + fb",
+     "add(ra, rb, ra, rb, ra, rb, ra, rb)"),
+]
+
+
+def per_op(stmt: str, names: dict) -> float:
+    return timeit.timeit(stmt, globals=names, number=NUMBER) / NUMBER * 1e9
+
+
+def main() -> None:
+    print(f"{'':20} {'python ns':>10} {'pyracket ns':>12} {'ratio':>6}")
+    for label, native, ours, a, b in CASES:
+        names = {"a": a, "b": b, "ra": integer(a), "rb": integer(b),
+                 "add": add, "mul": mul, "lt": lt}
+        base, mine = per_op(native, names), per_op(ours, names)
+        print(f"{label:20} {base:10.0f} {mine:12.0f} {mine / base:6.1f}")
+    names = {"fa": Fraction(3, 7), "fb": Fraction(-5, 11),
+             "ra": RkRational(Base.DECIMAL, 3, 7),
+             "rb": RkRational(Base.DECIMAL, -5, 11),
+             "add": add, "mul": mul, "div": div}
+    for label, fraction, ours in RATIONAL_CASES:
+        base, mine = per_op(fraction, names), per_op(ours, names)
+        print(f"{label:20} {base:10.0f} {mine:12.0f} {mine / base:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Compares ``parse_number_array`` with parsing each cell on its own, on a
+column of a million decimal integers and floats.
+
+Run with ``python -m benchmarks.number_array`` from the repository root.
+"""
+import random
+import time
+
+import numpy as np
+
+from pyracket.semantics.numbers import parse_number_array
+from pyracket.syntax.fastnum import parse_number
+
+CELLS = 1_000_000
+PER_ITEM_CELLS = 50_000
+
+
+def column(n: int) -> list[str]:
+    rng = random.Random(0)
+    return [str(rng.randint(-10 ** 9, 10 ** 9)) if rng.random() < 0.5
+            else repr(round(rng.uniform(-1e4, 1e4), rng.randint(0, 6)))
+            for _ in range(n)]
+
+
+def main() -> None:
+    texts = np.array(column(CELLS))
+    for dtype in ("float64", "int64", "object"):
+        start = time.perf_counter()
+        parse_number_array(texts, dtype)
+        seconds = time.perf_counter() - start
+        print(f"parse_number_array {dtype:8} {CELLS / seconds / 1e6:6.2f}"
+              f" M cells/s")
+    cells = texts[:PER_ITEM_CELLS].tolist()
+    start = time.perf_counter()
+    for cell in cells:
+        parse_number(cell)
+    seconds = time.perf_counter() - start
+    print(f"parse_number per cell    {len(cells) / seconds / 1e6:6.2f}"
+          f" M cells/s")
+
+
+if __name__ == "__main__":
+    main()
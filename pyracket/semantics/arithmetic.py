@@ -0,0 +1,433 @@
+"""Arithmetic on the exact numbers, following Racket.
+
+The results are ``RkInteger``s, ``RkRational``s and ``RkExactComplex``es in
+base 10. Exact floating-point literals count as the rationals they stand for,
+a rational whose denominator divides its numerator is an integer, and a
+complex whose imaginary part is zero is a real.
+
+The variadic operations work on ``(numerator, denominator)`` pairs and only
+reduce them by their gcd once, for the result, or when they grow past
+``REDUCE_BITS``. Operations on integers skip the pairs altogether, and small
+integer results come from a table instead of being built each time.
+
+``exact_to_inexact`` and ``inexact_to_exact`` convert between these and the
+flonums, ``RkInexactReal`` and ``RkInexactComplex``.
+"""
+import math
+from math import gcd as int_gcd, lcm as int_lcm
+from typing import Callable
+
+from pyracket.semantics.numbers import Base, PosOrNeg, RkExact, \
+    RkExactComplex, RkExactFloatingPoint, RkExactReal, RkInexact, \
+    RkInexactComplex, RkInexactReal, RkInteger, RkRational
+
+Ratio = tuple[int, int]
+
+# Unreduced pairs are reduced once their denominator has this many bits, to
+# keep long sums of unrelated fractions from growing without bound.
+REDUCE_BITS = 256
+
+SMALL_MIN = -256
+SMALL_MAX = 1024
+SMALL_INTEGERS = [
+    RkInteger(Base.DECIMAL, v) for v in range(SMALL_MIN, SMALL_MAX)]
+
+ZERO: Ratio = (0, 1)
+ONE: Ratio = (1, 1)
+
+# the types the binary fast paths take without going through complex parts
+REALS = {RkInteger, RkRational}
+
+
+# The frozen dataclasses' __init__ sets each field through
+# object.__setattr__. Their slot descriptors do the same for about half the
+# cost, and the results here never need RkRational's checks.
+new_number = object.__new__
+set_integer_base = RkInteger.base.__set__  # type: ignore[attr-defined]
+set_integer_value = RkInteger.value.__set__  # type: ignore[attr-defined]
+set_rational_base = RkRational.base.__set__  # type: ignore[attr-defined]
+set_numerator = RkRational.numerator.__set__  # type: ignore[attr-defined]
+set_denominator = RkRational.denominator.__set__  # type: ignore[attr-defined]
+
+
+def integer(value: int) -> RkInteger:
+    if SMALL_MIN <= value < SMALL_MAX:
+        return SMALL_INTEGERS[value - SMALL_MIN]
+    n = new_number(RkInteger)
+    set_integer_base(n, Base.DECIMAL)
+    set_integer_value(n, value)
+    return n
+
+def rational(num: int, den: int) -> RkRational:
+    """The ``RkRational`` for a reduced pair with ``den`` > 1."""
+    r = new_number(RkRational)
+    set_rational_base(r, Base.DECIMAL)
+    set_numerator(r, num)
+    set_denominator(r, den)
+    return r
+
+
+def ratio(n: RkExactReal) -> Ratio:
+    """``n`` as a pair with a positive denominator, not necessarily
+    reduced."""
+    if type(n) is RkInteger:
+        return n.value, 1
+    elif type(n) is RkRational:
+        return n.numerator, n.denominator
+    elif type(n) is RkExactFloatingPoint:
+        return n.as_integer_ratio()
+    raise TypeError(f"expected an exact real number, got {n!r}")
+
+def real_of(r: Ratio) -> RkExactReal:
+    """The normalised number for a pair."""
+    num, den = r
+    if den != 1:
+        g = int_gcd(num, den)
+        if g != 1:
+            num, den = num // g, den // g
+        if den != 1:
+            return rational(num, den)
+    return integer(num)
+
+def reduced(r: Ratio) -> Ratio:
+    num, den = r
+    g = int_gcd(num, den)
+    return (num // g, den // g) if g != 1 else r
+
+
+def add_ratios(a: Ratio, b: Ratio) -> Ratio:
+    if a[1] == b[1]:
+        return a[0] + b[0], a[1]
+    elif b[1] == 1:
+        return a[0] + b[0] * a[1], a[1]
+    elif a[1] == 1:
+        return a[0] * b[1] + b[0], b[1]
+    r = a[0] * b[1] + b[0] * a[1], a[1] * b[1]
+    return reduced(r) if r[1].bit_length() > REDUCE_BITS else r
+
+def neg_ratio(a: Ratio) -> Ratio:
+    return -a[0], a[1]
+
+def mul_ratios(a: Ratio, b: Ratio) -> Ratio:
+    r = a[0] * b[0], a[1] * b[1]
+    return reduced(r) if r[1].bit_length() > REDUCE_BITS else r
+
+def inv_ratio(a: Ratio, op: str) -> Ratio:
+    if a[0] == 0:
+        raise ZeroDivisionError(f"{op}: division by zero")
+    return (a[1], a[0]) if a[0] > 0 else (-a[1], -a[0])
+
+def cmp_ratios(a: Ratio, b: Ratio) -> int:
+    left, right = a[0] * b[1], b[0] * a[1]
+    return (left > right) - (left < right)
+
+
+# Complex numbers are worked on as pairs of ratios.
+Parts = tuple[Ratio, Ratio]
+
+def parts(n: RkExact) -> Parts:
+    if type(n) is RkExactComplex:
+        return ratio(n.real), ratio(n.imaginary)
+    return ratio(n), ZERO
+
+def number_of(p: Parts) -> RkExact:
+    real = real_of(p[0])
+    if p[1][0] == 0:
+        return real
+    return RkExactComplex(real, real_of(p[1]))
+
+def add_parts(a: Parts, b: Parts) -> Parts:
+    return add_ratios(a[0], b[0]), add_ratios(a[1], b[1])
+
+def neg_parts(a: Parts) -> Parts:
+    return neg_ratio(a[0]), neg_ratio(a[1])
+
+def mul_parts(a: Parts, b: Parts) -> Parts:
+    if b[1][0] == 0:
+        return mul_ratios(a[0], b[0]), mul_ratios(a[1], b[0])
+    return (add_ratios(mul_ratios(a[0], b[0]),
+                       neg_ratio(mul_ratios(a[1], b[1]))),
+            add_ratios(mul_ratios(a[0], b[1]), mul_ratios(a[1], b[0])))
+
+def inv_parts(a: Parts, op: str) -> Parts:
+    if a[1][0] == 0:
+        return inv_ratio(a[0], op), ZERO
+    # 1/(x+yi) = (x-yi)/(x^2+y^2)
+    scale = inv_ratio(
+        add_ratios(mul_ratios(a[0], a[0]), mul_ratios(a[1], a[1])), op)
+    return mul_ratios(a[0], scale), neg_ratio(mul_ratios(a[1], scale))
+
+
+def add(*numbers: RkExact) -> RkExact:
+    """``(+ n ...)``"""
+    if len(numbers) == 2:
+        a, b = numbers
+        if type(a) is RkInteger and type(b) is RkInteger:
+            return integer(a.value + b.value)
+        elif type(a) in REALS and type(b) in REALS:
+            return real_of(add_ratios(ratio(a), ratio(b)))
+    if all(type(n) is RkInteger for n in numbers):
+        return integer(sum(n.value for n in numbers))
+    total: Parts = (ZERO, ZERO)
+    for n in numbers:
+        total = add_parts(total, parts(n))
+    return number_of(total)
+
+def sub(first: RkExact, *rest: RkExact) -> RkExact:
+    """``(- n m ...)``, or the negation of ``n`` alone."""
+    if len(rest) == 1:
+        b = rest[0]
+        if type(first) is RkInteger and type(b) is RkInteger:
+            return integer(first.value - b.value)
+        elif type(first) in REALS and type(b) in REALS:
+            return real_of(add_ratios(ratio(first), neg_ratio(ratio(b))))
+    elif not rest:
+        if type(first) is RkInteger:
+            return integer(-first.value)
+        return number_of(neg_parts(parts(first)))
+    total = parts(first)
+    for n in rest:
+        total = add_parts(total, neg_parts(parts(n)))
+    return number_of(total)
+
+def mul(*numbers: RkExact) -> RkExact:
+    """``(* n ...)``"""
+    if len(numbers) == 2:
+        a, b = numbers
+        if type(a) is RkInteger and type(b) is RkInteger:
+            return integer(a.value * b.value)
+        elif type(a) in REALS and type(b) in REALS:
+            return real_of(mul_ratios(ratio(a), ratio(b)))
+    if all(type(n) is RkInteger for n in numbers):
+        product_value = 1
+        for n in numbers:
+            product_value *= n.value
+        return integer(product_value)
+    product: Parts = (ONE, ZERO)
+    for n in numbers:
+        product = mul_parts(product, parts(n))
+    return number_of(product)
+
+def div(first: RkExact, *rest: RkExact) -> RkExact:
+    """``(/ n m ...)``, or the reciprocal of ``n`` alone. Dividing by an
+    exact zero raises ``ZeroDivisionError``."""
+    if not rest:
+        return number_of(inv_parts(parts(first), "/"))
+    elif len(rest) == 1 and type(first) in REALS and type(rest[0]) in REALS:
+        return real_of(mul_ratios(ratio(first), inv_ratio(ratio(rest[0]), "/")))
+    product = parts(first)
+    for n in rest:
+        product = mul_parts(product, inv_parts(parts(n), "/"))
+    return number_of(product)
+
+
+def real_ratio(n: RkExact, op: str) -> Ratio:
+    if type(n) is RkExactComplex:
+        raise TypeError(f"{op}: contract violation, expected: real?, "
+                        f"given: {n!r}")
+    return ratio(n)
+
+def compare_chain(
+        op: str, holds: Callable[[int], bool], numbers: tuple[RkExact, ...]
+) -> bool:
+    ratios = [real_ratio(n, op) for n in numbers]
+    return all(holds(cmp_ratios(a, b)) for a, b in zip(ratios, ratios[1:]))
+
+def num_eq(*numbers: RkExact) -> bool:
+    """``(= n ...)``, which compares values and ignores bases, unlike
+    ``==``."""
+    ps = [parts(n) for n in numbers]
+    return all(cmp_ratios(a[0], b[0]) == 0 and cmp_ratios(a[1], b[1]) == 0
+               for a, b in zip(ps, ps[1:]))
+
+def lt(*numbers: RkExact) -> bool:
+    if len(numbers) == 2:
+        a, b = numbers
+        if type(a) is RkInteger and type(b) is RkInteger:
+            return a.value < b.value
+    return compare_chain("<", lambda c: c < 0, numbers)
+
+def le(*numbers: RkExact) -> bool:
+    if len(numbers) == 2:
+        a, b = numbers
+        if type(a) is RkInteger and type(b) is RkInteger:
+            return a.value <= b.value
+    return compare_chain("<=", lambda c: c <= 0, numbers)
+
+def gt(*numbers: RkExact) -> bool:
+    if len(numbers) == 2:
+        a, b = numbers
+        if type(a) is RkInteger and type(b) is RkInteger:
+            return a.value > b.value
+    return compare_chain(">", lambda c: c > 0, numbers)
+
+def ge(*numbers: RkExact) -> bool:
+    if len(numbers) == 2:
+        a, b = numbers
+        if type(a) is RkInteger and type(b) is RkInteger:
+            return a.value >= b.value
+    return compare_chain(">=", lambda c: c >= 0, numbers)
+
+
+def integer_value(n: RkExact, op: str) -> int:
+    if type(n) is RkInteger:
+        return n.value
+    num, den = ratio(n) if type(n) is not RkExactComplex else (0, 0)
+    if den == 0 or num % den:
+        raise TypeError(f"{op}: contract violation, expected: integer?, "
+                        f"given: {n!r}")
+    return num // den
+
+def divisor_value(n: RkExact, op: str) -> int:
+    value = integer_value(n, op)
+    if value == 0:
+        raise ZeroDivisionError(f"{op}: undefined for 0")
+    return value
+
+def quotient(n: RkExact, m: RkExact) -> RkInteger:
+    """``n / m`` truncated towards zero."""
+    a, b = integer_value(n, "quotient"), divisor_value(m, "quotient")
+    q = abs(a) // abs(b)
+    return integer(q if (a < 0) == (b < 0) else -q)
+
+def remainder(n: RkExact, m: RkExact) -> RkInteger:
+    """What is left from ``quotient``, with the sign of ``n``."""
+    a, b = integer_value(n, "remainder"), divisor_value(m, "remainder")
+    r = abs(a) % abs(b)
+    return integer(r if a >= 0 else -r)
+
+def modulo(n: RkExact, m: RkExact) -> RkInteger:
+    """What is left from flooring ``n / m``, with the sign of ``m``."""
+    return integer(integer_value(n, "modulo") % divisor_value(m, "modulo"))
+
+
+def exact_root(value: int, k: int) -> int:
+    """The ``k``th root of ``value`` >= 0, or -1 if it isn't an integer."""
+    if value < 2:
+        return value
+    # Newton's method from above, in integers
+    guess = 1 << -(-value.bit_length() // k)
+    while True:
+        better = ((k - 1) * guess + value // guess ** (k - 1)) // k
+        if better >= guess:
+            break
+        guess = better
+    return guess if guess ** k == value else -1
+
+def expt(base: RkExact, power: RkExact) -> RkExact:
+    """``base`` to the ``power``. A fractional power of a rational is only
+    supported when the result is exact."""
+    if type(base) is RkInteger and type(power) is RkInteger \
+            and power.value >= 0:
+        return integer(base.value ** power.value)
+    num, den = reduced(real_ratio(power, "expt"))
+    if den == 1:
+        result: Parts = (ONE, ZERO)
+        square, exponent = parts(base), abs(num)
+        while exponent:
+            if exponent & 1:
+                result = mul_parts(result, square)
+            exponent >>= 1
+            if exponent:
+                square = mul_parts(square, square)
+        return number_of(inv_parts(result, "expt") if num < 0 else result)
+    b_num, b_den = reduced(real_ratio(base, "expt"))
+    root_num, root_den = exact_root(b_num, den), exact_root(b_den, den)
+    if root_num < 0 or root_den < 0:
+        raise ValueError(f"expt: no exact result for {base!r} and {power!r}")
+    return expt(real_of((root_num, root_den)), integer(num))
+
+
+def gcd(*numbers: RkExact) -> RkExactReal:
+    """The largest rational that divides every argument a whole number of
+    times, 0 for none."""
+    ratios = [reduced(real_ratio(n, "gcd")) for n in numbers]
+    if all(den == 1 for _, den in ratios):
+        return integer(int_gcd(*(num for num, _ in ratios)))
+    return real_of((int_gcd(*(num for num, _ in ratios)),
+                    int_lcm(*(den for _, den in ratios))))
+
+def lcm(*numbers: RkExact) -> RkExactReal:
+    """The smallest rational that every argument divides a whole number of
+    times, 1 for none and 0 if any is 0."""
+    ratios = [reduced(real_ratio(n, "lcm")) for n in numbers]
+    if all(den == 1 for _, den in ratios):
+        return integer(int_lcm(*(num for num, _ in ratios)))
+    return real_of((int_lcm(*(num for num, _ in ratios)),
+                    int_gcd(*(den for _, den in ratios))))
+
+
+def numerator(n: RkExact) -> RkInteger:
+    return integer(reduced(real_ratio(n, "numerator"))[0])
+
+def denominator(n: RkExact) -> RkInteger:
+    return integer(reduced(real_ratio(n, "denominator"))[1])
+
+
+# A float's magnitude is below 2**1024, and its smallest step 2**-1074.
+# Outside these a value rounds to infinity or zero whatever its digits.
+MAX_FLOAT_BITS = 1026
+MIN_FLOAT_BITS = -1076
+
+def float_of_ratio(num: int, den: int) -> float:
+    """``num / den`` correctly rounded; int division rounds once, from the
+    exact quotient."""
+    try:
+        return num / den
+    except OverflowError:
+        return math.inf if (num < 0) == (den < 0) else -math.inf
+
+def float_of_power(m: int, base: int, exponent: int) -> float:
+    """``m * base**exponent`` correctly rounded, for ``m`` >= 0, without
+    building the power when the result must be infinite or zero."""
+    if m == 0:
+        return 0.0
+    bits = m.bit_length() + exponent * math.log2(base)
+    if bits > MAX_FLOAT_BITS:
+        return math.inf
+    elif bits < MIN_FLOAT_BITS:
+        return 0.0
+    elif exponent >= 0:
+        return float_of_ratio(m * base ** exponent, 1)
+    return float_of_ratio(m, base ** -exponent)
+
+def float_of(n: RkExactReal) -> float:
+    if type(n) is RkInteger:
+        return float_of_ratio(n.value, 1)
+    elif type(n) is RkRational:
+        return float_of_ratio(n.numerator, n.denominator)
+    elif type(n) is RkExactFloatingPoint:
+        # an exact zero has no sign, but a tiny negative value rounds to -0.0
+        negative = n.sign is PosOrNeg.NEG and n.digits.strip("0") != ""
+        if n.base is Base.DECIMAL:
+            # the platform's conversion is correctly rounded, and quickest
+            return float(
+                f"{'-' if negative else ''}{n.digits}e{n.exponent.value}")
+        value = float_of_power(
+            int(n.digits, n.base.value), n.base.value, n.exponent.value)
+        return -value if negative else value
+    raise TypeError(f"expected an exact real number, got {n!r}")
+
+def exact_to_inexact(n: RkExact) -> RkInexact:
+    """``(exact->inexact n)``: the nearest flonum to ``n``, or a complex of
+    the nearest to each part. Values too large for a float become
+    infinities."""
+    if type(n) is RkExactComplex:
+        return RkInexactComplex(float_of(n.real), float_of(n.imaginary))
+    return RkInexactReal(float_of(n))
+
+def exact_of_float(value: float) -> RkExactReal:
+    if not math.isfinite(value):
+        raise ValueError(f"inexact->exact: no exact representation for "
+                         f"{value!r}")
+    return real_of(value.as_integer_ratio())
+
+def inexact_to_exact(n: RkInexact) -> RkExact:
+    """``(inexact->exact n)``: the exact value of a flonum, which is always
+    a dyadic rational. Infinities and NaNs raise ``ValueError``."""
+    if type(n) is RkInexactComplex:
+        return number_of((ratio(exact_of_float(n.real)),
+                          ratio(exact_of_float(n.imaginary))))
+    elif type(n) is RkInexactReal:
+        return exact_of_float(n.value)
+    raise TypeError(f"expected an inexact number, got {n!r}")
@@ -2,7 +2,12 @@ import decimal
 from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+import math
+from math import gcd
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class PosOrNeg(Enum):
@@ -31,20 +36,32 @@ BASE_TO_ALPH = {
 }
 
 
+# For each base b, (f, p) with 10**p / b == f, so that
+# 1 / b**k == f**k / 10**(p*k).
+DECIMAL_SCALES = {
+    Base.BINARY: (5, 1),
+    Base.OCTAL: (125, 3),
+    Base.DECIMAL: (1, 1),
+    Base.HEXADECIMAL: (625, 4),
+}
+
+
 class RkNumber:
+    __slots__ = ()
+
     def negate(self):
         pass
 
 
 class RkExact(RkNumber):
-    pass
+    __slots__ = ()
 
 
 class RkExactReal(RkExact):
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RkInteger(RkExactReal):
     base: Base
     value: int
@@ -52,7 +69,7 @@ class RkInteger(RkExactReal):
     def negate(self):
         return RkInteger(self.base, -1 * self.value)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RkRational(RkExactReal):
     base: Base
     # normalized so that denominator is always positive
@@ -64,14 +81,14 @@ class RkRational(RkExactReal):
             raise ValueError("denominator cannot be zero")
         elif denom < 0:
             num, denom = -num, -denom
-        self.base = base
-        self.numerator = num
-        self.denominator = denom
+        object.__setattr__(self, "base", base)
+        object.__setattr__(self, "numerator", num)
+        object.__setattr__(self, "denominator", denom)
 
     def negate(self):
         return RkRational(self.base, -1 * self.numerator, self.denominator)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RkExactFloatingPoint(RkExactReal):
     base: Base
     sign: PosOrNeg
@@ -80,34 +97,112 @@ class RkExactFloatingPoint(RkExactReal):
     _dec: Optional[Decimal] = (
         field(init=False, repr=False, compare=False, default=None))
 
-    def dec(self) -> Decimal:
-        if not self._dec:
-            new_prec = max(len(self.digits), decimal.getcontext().prec)
-            decimal.setcontext(decimal.Context(prec=new_prec))
-            self._dec = ((-1 if self.sign is PosOrNeg.NEG else 1)
-                    * Decimal(int(self.digits, self.base.value))
-                     * Decimal(self.base.value) ** Decimal(self.exponent.value))
-        return self._dec
+    def as_integer_ratio(self) -> tuple[int, int]:
+        """The value as a reduced (numerator, denominator) pair, with a
+        positive denominator."""
+        base = self.base.value
+        num = int(self.digits, base)
+        if self.sign is PosOrNeg.NEG:
+            num = -num
+        if self.exponent.value >= 0:
+            return num * base ** self.exponent.value, 1
+        den = base ** -self.exponent.value
+        g = gcd(num, den)
+        return num // g, den // g
+
+    def dec(self, context: Optional[decimal.Context] = None) -> Decimal:
+        """The exact value as a ``Decimal``, or rounded by ``context`` if
+        one is given. Neither uses or changes the thread's context.
+
+        Every base divides a power of ten, so the value always has a finite
+        decimal expansion: with ``10**p / b == f``, ``m / b**k`` is
+        ``m * f**k / 10**(p*k)``. The exact value is computed once and kept.
+        """
+        if self._dec is None:
+            object.__setattr__(self, "_dec", self.exact_decimal())
+        assert self._dec is not None
+        return self._dec if context is None else context.plus(self._dec)
+
+    def exact_decimal(self) -> Decimal:
+        base = self.base.value
+        coefficient = int(self.digits, base)
+        exponent = self.exponent.value
+        if exponent >= 0:
+            coefficient *= base ** exponent
+            exponent = 0
+        else:
+            factor, places = DECIMAL_SCALES[self.base]
+            coefficient *= factor ** -exponent
+            exponent *= places
+        # built from a string, a Decimal is exact whatever the context
+        return Decimal(f"{self.sign.value}{coefficient}E{exponent}")
 
     def negate(self) -> "RkExactFloatingPoint":
         return RkExactFloatingPoint(
             self.base, self.sign.negate(), self.digits, self.exponent)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RkExactComplex(RkExact):
     real: RkExactReal
     imaginary: RkExactReal
 
 
 class RkInexact(RkNumber):
-    pass
+    __slots__ = ()
 
 
+def flonum_key(value: float) -> tuple[float, ...]:
+    """What tells floats apart for Racket's ``eqv?``: unlike ``==``, 0.0 and
+    -0.0 differ and every NaN is the same."""
+    if math.isnan(value):
+        return ()
+    return value, math.copysign(1.0, value)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class RkInexactReal(RkInexact):
     value: float
 
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not RkInexactReal:
+            return NotImplemented
+        return flonum_key(self.value) == flonum_key(other.value)
+
+    def __hash__(self) -> int:
+        return hash(flonum_key(self.value))
 
+    def negate(self) -> "RkInexactReal":
+        return RkInexactReal(-self.value)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class RkInexactComplex(RkInexact):
     real: float
     imaginary: float
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not RkInexactComplex:
+            return NotImplemented
+        return (flonum_key(self.real) == flonum_key(other.real)
+                and flonum_key(self.imaginary) == flonum_key(other.imaginary))
+
+    def __hash__(self) -> int:
+        return hash((flonum_key(self.real), flonum_key(self.imaginary)))
+
+    def negate(self) -> "RkInexactComplex":
+        return RkInexactComplex(-self.real, -self.imaginary)
+
+
+def parse_number_array(
+        strings: Any, dtype: Any = "float64"
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """Parse a column of numeric literals into a NumPy array and a validity
+    mask; see ``pyracket.syntax.number_array``, which needs NumPy."""
+    try:
+        from pyracket.syntax.number_array import parse_number_array as parse
+    except ImportError as e:
+        if e.name != "numpy":
+            raise
+        raise ImportError("parse_number_array needs NumPy") from e
+    return parse(strings, dtype)
@@ -1,24 +1,282 @@
+import hashlib
+import multiprocessing
+import os
+import sys
+from dataclasses import dataclass
+from functools import cache
 from importlib import resources as impres
-from typing import TypeVar, cast
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TypeVar, Union, cast
+
+import lark
 from lark import Lark, ast_utils
-from lark.ast_utils import Ast
+from lark.exceptions import UnexpectedInput
 from lark.tree import Meta
 
-from pyracket.syntax.expr_ast import ToAstExpr
+from pyracket.syntax.columnar import AstStore
+from pyracket.syntax.expr_ast import PyracketAst, ToAstExpr
+from pyracket.syntax.fastnum import parse_number
+from pyracket.syntax.incremental import Edit, reparse
+from pyracket.syntax.interning import Interner
+from pyracket.syntax.stream import Piece, Source, chunks_of, iter_pieces, \
+    shift_error, shift_meta
+from pyracket.syntax.span import LineIndex, Span
 
 T = TypeVar("T")
 
 expr_transformer = ToAstExpr()
+span_transformer = ToAstExpr(spans=True)
+
+# Every rule that is useful to parse on its own. The shared parser accepts all
+# of them, so one LALR table serves every caller.
+START_SYMBOLS = (
+    "file",
+    "expr",
+    "boolean",
+    "string",
+    "number",
+    "exact",
+    "exact_real",
+    "exact_integer",
+    "exact_rational",
+    "exact_floating_point",
+    "exact_complex",
+    "inexact",
+    "inexact_real",
+    "inexact_complex",
+)
 
 class PyracketParser(Lark):
+    """Lark parser for expr.lark that produces ASTs.
+
+    By default this is an LALR parser with ``ToAstExpr`` applied inline, so no
+    parse tree is built. ``parser="earley"`` builds the tree and transforms it
+    afterwards, which gives the same ASTs.
+
+    ``cache=True`` stores the compiled parser under ``cache_dir()``, in a file
+    named after a hash of the grammar, the options, and the Lark and Python
+    versions, so a changed grammar or Lark upgrade is never served stale.
+
+    ``intern=True`` (or an ``Interner`` to share between parsers) makes equal
+    literal values share one object, which saves memory on repetitive input.
+    Each AST still has its own ``meta``.
+
+    ``spans=True`` gives every AST a compact ``Span`` instead of a Lark
+    ``Meta``. Its lines and columns are worked out when asked for, from a
+    ``LineIndex`` shared by the ASTs of one parse.
+
+    Parsing from ``number`` tries ``fastnum.parse_number`` first and only runs
+    Lark when that gives up, which is also how errors get reported.
+    """
+
     def __init__(
-            self, **options
+            self,
+            intern: Union[bool, Interner] = False,
+            spans: bool = False,
+            **options
     ) -> None:
+        self.interner = Interner() if intern is True else intern or None
+        self.spans = spans
+        self.ast_transformer = span_transformer if spans else expr_transformer
+        options.setdefault("parser", "lalr")
+        if options["parser"] == "lalr":
+            options.setdefault("transformer", self.ast_transformer)
+        if options.get("cache") is True:
+            options["cache"] = str(grammar_cache_path(options))
         super().__init__(
-            read_expr_grammar(), propagate_positions=True, **options)
+            read_expr_grammar(), **options)
+
+    def parse_ast(self, text: str, start: Optional[str] = None) -> PyracketAst:
+        result = self.parse_unfinished(text, start)
+        self.finish(result if isinstance(result, list) else [result],
+                    LineIndex(text) if self.spans else None)
+        return result
+
+    def parse_unfinished(self, text: str, start: Optional[str]) -> PyracketAst:
+        """``parse_ast`` without interning, and with spans not yet given
+        their line index."""
+        if (start or self.options.start[0]) == "number":
+            number = parse_number(text, self.spans)
+            if number is not None:
+                return number
+        if self.options.transformer:
+            return cast(PyracketAst, self.parse(text, start=start))
+        return cast(PyracketAst, self.ast_transformer.transform(
+            self.parse(text, start=start)))
+
+    def finish(self, forms: list[PyracketAst], lines: Optional[LineIndex]) -> None:
+        if self.interner:
+            self.interner.intern_values(forms)
+        if lines is not None:
+            # a parser with a line index gives its forms spans
+            for form in forms:
+                cast(Span, form.meta).lines = lines
+
+    def iter_file(self, source: Source) -> Iterator[PyracketAst]:
+        """The top-level forms of ``source``, as soon as each is complete.
+
+        ``source`` is a path, a text stream or an iterable of strings. The
+        ASTs are the ones ``parse_ast(text, start="file")`` gives for the
+        whole text, with the same positions, but only the form being parsed
+        is held in memory. The parser must accept the ``file`` start symbol.
+        """
+        lines = LineIndex() if self.spans else None
+        for piece in iter_pieces(chunks_of(source)):
+            if lines is not None:
+                lines.add(piece.text, piece.start_pos)
+            yield from self.parse_piece(piece, lines)
+
+    def parse_piece(
+            self, piece: Piece, lines: Optional[LineIndex] = None
+    ) -> list[PyracketAst]:
+        """The forms of one piece of a file, at their places in the file.
+        With spans, ``lines`` is the index of the whole file."""
+        forms: list[PyracketAst]
+        number = (parse_number(piece.text, self.spans)
+                  if not piece.text.startswith('"') else None)
+        if number is not None:
+            forms = [number]
+        else:
+            try:
+                forms = cast(list[PyracketAst],
+                             self.parse_unfinished(piece.text, "file"))
+            except UnexpectedInput as e:
+                shift_error(e, piece)
+                raise
+        for form in forms:
+            shift_meta(form.meta, piece)
+        self.finish(forms, lines)
+        return forms
+
+    def parse_columnar(self, source: Source) -> AstStore:
+        """The top-level forms of ``source`` (as for ``iter_file``) in an
+        ``AstStore``, which keeps them in typed arrays. Each form is only
+        built long enough to be stored, so a ``spans=True`` parser is the
+        cheaper one to use."""
+        store = AstStore()
+        for piece in iter_pieces(chunks_of(source)):
+            store.lines.add(piece.text, piece.start_pos)
+            for form in self.parse_piece(piece):
+                store.append(form)
+        return store
+
+    def parse_path(self, path: Union[str, os.PathLike]) -> list[PyracketAst]:
+        """The top-level forms of a UTF-8 file, as ``parse_ast`` gives them
+        for its text. The file is memory-mapped and decoded a chunk at a
+        time, so only the ASTs stay in memory."""
+        return list(self.iter_file(path))
 
-    def parse_ast(self, text: str) -> Ast:
-        return cast(Ast, expr_transformer.transform(self.parse(text)))
+    def reparse(
+            self, forms: list[PyracketAst], text: str, edits: Iterable[Edit]
+    ) -> list[PyracketAst]:
+        """Update ``forms``, the top-level forms of a text, to be those of
+        ``text``, the result of applying ``edits`` to it, and return it.
 
+        Each edit is ``(offset, deleted length, inserted text)``, with the
+        offset into the text as the edits before it left it. Only the forms
+        around the edits are parsed again. The list is changed in place, and
+        the forms after the edits are kept, with their ``meta`` shifted in
+        place.
+        """
+        lines = None
+        if self.spans:
+            # the spans of the forms share one index, which now has to
+            # describe the new text
+            lines = cast(Span, forms[0].meta).lines if forms else None
+            lines = lines if lines is not None else LineIndex()
+            lines.reset(text)
+        return reparse(lambda piece: self.parse_piece(piece, lines),
+                       forms, text, edits)
+
+
+@dataclass(frozen=True)
+class StartParser:
+    """The shared parser, fixed to one start symbol."""
+    parser: PyracketParser
+    start: str
+
+    def parse_ast(self, text: str) -> PyracketAst:
+        return self.parser.parse_ast(text, start=self.start)
+
+
+@cache
+def shared_parser() -> PyracketParser:
+    """One cached LALR parser covering every symbol in ``START_SYMBOLS``."""
+    return PyracketParser(start=list(START_SYMBOLS), cache=True)
+
+def get_parser(start: str = "file") -> StartParser:
+    if start not in START_SYMBOLS:
+        raise ValueError(f"Not a start symbol: {start}")
+    return StartParser(shared_parser(), start)
+
+
+@dataclass(frozen=True)
+class ParseResult:
+    """The forms of one file from ``parse_many``, or why it has none.
+
+    Lark's exceptions hold the parser state and can't be sent between
+    processes, so a failure is kept as its message and, for syntax errors,
+    where in the file it happened.
+    """
+    path: str
+    forms: Optional[list[PyracketAst]] = None
+    error: Optional[str] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+
+def parse_file(path: Union[str, os.PathLike]) -> ParseResult:
+    try:
+        return ParseResult(os.fspath(path), shared_parser().parse_path(path))
+    except UnexpectedInput as e:
+        return ParseResult(os.fspath(path), error=str(e),
+                           line=e.line, column=e.column)
+    except (OSError, ValueError) as e:
+        return ParseResult(os.fspath(path), error=f"{type(e).__name__}: {e}")
+
+def parse_many(
+        paths: Iterable[Union[str, os.PathLike]],
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        chunksize: int = 16,
+) -> Iterator[ParseResult]:
+    """Parse many files with a pool of ``workers`` processes (one per CPU by
+    default), each with its own ``shared_parser()``.
+
+    Results come in the order of ``paths`` or, if not ``ordered``, as they are
+    finished. A file that can't be read or parsed gets a result with an
+    ``error`` and the rest of the batch carries on. Files are handed to the
+    workers ``chunksize`` at a time, which keeps the cost of sending them
+    small next to that of parsing. With ``workers=1`` the files are parsed in
+    this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(parse_file, paths)
+        return
+    with multiprocessing.Pool(workers, initializer=shared_parser) as pool:
+        imap = pool.imap if ordered else pool.imap_unordered
+        yield from imap(parse_file, paths, chunksize)
+
+@cache
 def read_expr_grammar() -> str:
     return (impres.files(__package__) / "expr.lark").read_text()
+
+def cache_dir() -> Path:
+    if "PYRACKET_CACHE_DIR" in os.environ:
+        return Path(os.environ["PYRACKET_CACHE_DIR"])
+    xdg = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg) / "pyracket"
+
+def grammar_cache_path(options: dict) -> Path:
+    # Lark re-checks its own hash on load; this one just keeps files for
+    # different grammars and versions apart.
+    key = hashlib.sha256("".join([
+        read_expr_grammar(),
+        repr(sorted((k, repr(v)) for k, v in options.items()
+                    if k not in ("cache", "transformer"))),
+        lark.__version__,
+        str(sys.version_info[:2]),
+    ]).encode()).hexdigest()
+    directory = cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"expr-{key[:16]}.lark"
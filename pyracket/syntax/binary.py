@@ -0,0 +1,405 @@
+"""A binary format for top-level forms, for reading them back without
+parsing.
+
+A dump is a header followed by sections, all little-endian::
+
+    header   magic, version, node count, line count, heap size
+    starts   int64 per node
+    ends     int64 per node
+    refs     int64 per node, the offset of the node's value in the heap,
+             the value of an integer that fits in 64 bits, or the bits of
+             an inexact real
+    lines    int64 per line, the offsets at which lines start
+    kinds    uint8 per node, a ``columnar.Kind``
+    bases    uint8 per node, the base of a number's value, 0 otherwise,
+             or'd with ``INLINE`` if its integers fit in 64 bits
+    heap     the distinct values, encoded by ``encode_value``
+
+``load`` maps the file and casts the fixed-size sections in place, so opening
+a dump costs the same whatever its size. A node is decoded when it is
+indexed, with a ``Span`` that shares the dump's line index. Nodes with equal
+values share the value object, as with an interning parser, and it is only
+decoded once.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Optional, \
+    Union, overload
+
+from pyracket.semantics.numbers import Base, PosOrNeg, RkExactComplex, \
+    RkExactFloatingPoint, RkInexactComplex, RkInexactReal, RkInteger, \
+    RkRational
+from pyracket.syntax.columnar import AstStore, Kind, base_of, fits, kind_of
+from pyracket.syntax.expr_ast import BooleanAst, ExactComplexAst, \
+    ExactFloatingPointAst, InexactComplexAst, InexactRealAst, IntegerAst, \
+    PyracketAst, RationalAst, StringAst
+from pyracket.syntax.span import LineIndex, Span
+
+MAGIC = b"RKAS"
+VERSION = 2
+
+HEADER = struct.Struct("<4sHxxqqq")
+LENGTH = struct.Struct("<I")
+WORD = struct.Struct("<q")
+PAIR = struct.Struct("<qq")
+DOUBLE = struct.Struct("<d")
+DOUBLES = struct.Struct("<dd")
+
+# Set in the base of a value whose integers are stored as int64s rather than
+# with their lengths, which is much quicker to decode.
+INLINE = 0x80
+
+# the node classes by kind, for the kinds with a value in the heap
+AST_CLASSES: dict[int, Any] = {
+    Kind.STRING: StringAst,
+    Kind.INTEGER: IntegerAst,
+    Kind.RATIONAL: RationalAst,
+    Kind.FLOATING_POINT: ExactFloatingPointAst,
+    Kind.COMPLEX: ExactComplexAst,
+    Kind.INEXACT_COMPLEX: InexactComplexAst,
+}
+
+REAL_KINDS = {
+    RkInteger: Kind.INTEGER,
+    RkRational: Kind.RATIONAL,
+    RkExactFloatingPoint: Kind.FLOATING_POINT,
+}
+
+
+# Lengths below LONG are one byte; longer ones are LONG and then a LENGTH.
+LONG = 0xFF
+
+BASES = {base.value: base for base in Base}
+
+
+def encode_length(length: int, out: bytearray) -> None:
+    if length < LONG:
+        out.append(length)
+    else:
+        out.append(LONG)
+        out += LENGTH.pack(length)
+
+def decode_length(data: memoryview, pos: int) -> tuple[int, int]:
+    length = data[pos]
+    if length < LONG:
+        return length, pos + 1
+    return LENGTH.unpack_from(data, pos + 1)[0], pos + 1 + LENGTH.size
+
+def encode_int(value: int, out: bytearray) -> None:
+    data = value.to_bytes(
+        (value + (value < 0)).bit_length() // 8 + 1, "little", signed=True)
+    encode_length(len(data), out)
+    out += data
+
+def decode_int(data: memoryview, pos: int) -> tuple[int, int]:
+    length, pos = decode_length(data, pos)
+    end = pos + length
+    return int.from_bytes(data[pos:end], "little", signed=True), end
+
+def encode_str(value: str, out: bytearray) -> None:
+    data = value.encode()
+    encode_length(len(data), out)
+    out += data
+
+def decode_str(data: memoryview, pos: int) -> tuple[str, int]:
+    length, pos = decode_length(data, pos)
+    end = pos + length
+    return str(data[pos:end], "utf-8"), end
+
+
+def encode_value(kind: Kind, value: Any, out: bytearray) -> int:
+    """Append the heap encoding of a value of a node of ``kind``, and return
+    ``INLINE`` if its integers were stored as int64s, or else 0.
+
+    The base of a node's value is kept in its own section, but the parts of
+    a complex carry their kind and base along with them."""
+    if kind == Kind.STRING:
+        encode_str(value, out)
+    elif kind == Kind.INTEGER:
+        if fits(value.value):
+            out += WORD.pack(value.value)
+            return INLINE
+        encode_int(value.value, out)
+    elif kind == Kind.RATIONAL:
+        if fits(value.numerator, value.denominator):
+            out += PAIR.pack(value.numerator, value.denominator)
+            return INLINE
+        encode_int(value.numerator, out)
+        encode_int(value.denominator, out)
+    elif kind == Kind.FLOATING_POINT:
+        out.append(value.sign is PosOrNeg.NEG)
+        encode_str(value.digits, out)
+        encode_int(value.exponent.value, out)
+    elif kind == Kind.COMPLEX:
+        for part in (value.real, value.imaginary):
+            part_kind = REAL_KINDS[type(part)]
+            at = len(out)
+            out += bytes((part_kind, part.base.value))
+            out[at + 1] |= encode_value(part_kind, part, out)
+    elif kind == Kind.INEXACT_COMPLEX:
+        out += DOUBLES.pack(value.real, value.imaginary)
+    return 0
+
+# The decoders take the base of the value, with its ``INLINE`` flag, the heap
+# and the position of the value in it, and return the value and the position
+# after it.
+
+def decode_string(base: int, data: memoryview, pos: int) -> tuple[str, int]:
+    return decode_str(data, pos)
+
+def decode_integer(
+        base: int, data: memoryview, pos: int
+) -> tuple[RkInteger, int]:
+    if base & INLINE:
+        return RkInteger(BASES[base ^ INLINE], WORD.unpack_from(data, pos)[0]), \
+            pos + WORD.size
+    value, pos = decode_int(data, pos)
+    return RkInteger(BASES[base], value), pos
+
+def decode_rational(
+        base: int, data: memoryview, pos: int
+) -> tuple[RkRational, int]:
+    if base & INLINE:
+        num, den = PAIR.unpack_from(data, pos)
+        return RkRational(BASES[base ^ INLINE], num, den), pos + PAIR.size
+    num, pos = decode_int(data, pos)
+    den, pos = decode_int(data, pos)
+    return RkRational(BASES[base], num, den), pos
+
+def decode_floating_point(
+        base: int, data: memoryview, pos: int
+) -> tuple[RkExactFloatingPoint, int]:
+    sign = PosOrNeg.NEG if data[pos] else PosOrNeg.POS
+    digits, pos = decode_str(data, pos + 1)
+    exponent, pos = decode_int(data, pos)
+    return RkExactFloatingPoint(
+        BASES[base], sign, digits, RkInteger(BASES[base], exponent)), pos
+
+def decode_complex(
+        base: int, data: memoryview, pos: int
+) -> tuple[RkExactComplex, int]:
+    real, pos = DECODERS[data[pos]](data[pos + 1], data, pos + 2)
+    imaginary, pos = DECODERS[data[pos]](data[pos + 1], data, pos + 2)
+    return RkExactComplex(real, imaginary), pos
+
+def decode_inexact_complex(
+        base: int, data: memoryview, pos: int
+) -> tuple[RkInexactComplex, int]:
+    return RkInexactComplex(*DOUBLES.unpack_from(data, pos)), \
+        pos + DOUBLES.size
+
+DECODERS: dict[int, Callable[[int, memoryview, int], tuple[Any, int]]] = {
+    Kind.STRING: decode_string,
+    Kind.INTEGER: decode_integer,
+    Kind.RATIONAL: decode_rational,
+    Kind.FLOATING_POINT: decode_floating_point,
+    Kind.COMPLEX: decode_complex,
+    Kind.INEXACT_COMPLEX: decode_inexact_complex,
+}
+
+
+# An inexact real is kept in its node's ref, as the bits of the double.
+def float_bits(value: float) -> int:
+    return WORD.unpack(DOUBLE.pack(value))[0]
+
+def bits_float(bits: int) -> float:
+    return DOUBLE.unpack(WORD.pack(bits))[0]
+
+
+def lines_of(forms: Sequence[PyracketAst]) -> array:
+    """The line starts to store for ``forms``.
+
+    Spans bring their line index along. ``Meta``s only tell where the lines
+    they start and end on begin; any line in between lies inside a form, so
+    it is given the start of the next known line, which keeps ``line_of``
+    right at every position a form starts or ends at.
+    """
+    if isinstance(forms, AstStore):
+        return forms.lines.starts
+    if not forms:
+        return array("q", [0])
+    meta = forms[0].meta
+    if isinstance(meta, Span) and meta.lines is not None:
+        return meta.lines.starts
+    known = {1: 0}
+    for form in forms:
+        meta = form.meta
+        known[meta.line] = meta.start_pos - meta.column + 1
+        known[meta.end_line] = meta.end_pos - meta.end_column + 1
+    starts = array("q", bytes(8 * max(known)))
+    following = 0
+    for line in range(len(starts), 0, -1):
+        following = known.get(line, following)
+        starts[line - 1] = following
+    return starts
+
+
+def dumps(forms: Iterable[PyracketAst]) -> bytes:
+    """Encode ``forms``, a list of top-level forms with positions in one
+    text, or an ``AstStore``."""
+    if not isinstance(forms, Sequence):
+        forms = list(forms)
+    lines = lines_of(forms)
+    kinds = bytearray()
+    bases = bytearray()
+    starts, ends, refs = array("q"), array("q"), array("q")
+    heap = bytearray()
+    # the place and flags of each distinct value in the heap
+    stored: dict[tuple[Kind, Any], tuple[int, int]] = {}
+    for form in forms:
+        kind, value = kind_of(form), form.value
+        if kind == Kind.INTEGER and fits(value.value):
+            flags, ref = INLINE, value.value
+        elif kind == Kind.INEXACT_REAL:
+            flags, ref = 0, float_bits(value.value)
+        elif kind >= Kind.STRING:
+            key = (kind, value)
+            if key not in stored:
+                ref = len(heap)
+                stored[key] = ref, encode_value(kind, value, heap)
+            ref, flags = stored[key]
+        else:
+            flags, ref = 0, 0
+        kinds.append(kind)
+        bases.append(base_of(form) | flags)
+        starts.append(form.meta.start_pos)
+        ends.append(form.meta.end_pos)
+        refs.append(ref)
+    words = [starts, ends, refs, array("q", lines)]
+    if sys.byteorder == "big":
+        for section in words:
+            section.byteswap()
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, len(kinds), len(lines), len(heap)),
+        *(section.tobytes() for section in words),
+        kinds, bases, heap])
+
+def dump(
+        forms: Iterable[PyracketAst],
+        file: Union[str, os.PathLike, BinaryIO]
+) -> None:
+    """Write ``dumps(forms)`` to a path or binary file."""
+    data = dumps(forms)
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as f:
+            f.write(data)
+    else:
+        file.write(data)
+
+
+class AstDump(Sequence[PyracketAst]):
+    """The forms of a dump, decoded as they are indexed.
+
+    The sections are views of ``data``; one made by ``load`` keeps its file
+    mapped until it is closed, which it is on leaving a ``with`` block. The
+    nodes it gave out stay usable after that.
+    """
+
+    def __init__(self, data: Any, mapped: Optional[mmap.mmap] = None) -> None:
+        if len(data) < HEADER.size:
+            raise ValueError("Not a pyracket AST dump")
+        magic, version, n, m, heap_size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a pyracket AST dump")
+        if version != VERSION:
+            raise ValueError(f"Unsupported AST dump version {version}")
+        if len(data) != HEADER.size + 26 * n + 8 * m + heap_size:
+            raise ValueError("Truncated pyracket AST dump")
+        self.mapped = mapped
+        self.data = memoryview(data)
+        pos = HEADER.size
+        self.starts, pos = self.section(pos, n, "q")
+        self.ends, pos = self.section(pos, n, "q")
+        self.refs, pos = self.section(pos, n, "q")
+        line_starts, pos = self.section(pos, m, "q")
+        self.kinds, pos = self.section(pos, n, "B")
+        self.bases, pos = self.section(pos, n, "B")
+        self.heap = self.data[pos:]
+        # copied, so that decoded nodes keep working once this is closed
+        self.lines = LineIndex()
+        self.lines.starts = array("q", line_starts)
+        if isinstance(line_starts, memoryview):
+            line_starts.release()
+        # the values decoded so far, by their place in the heap
+        self.values: dict[int, Any] = {}
+
+    def section(self, pos: int, count: int, typecode: str) -> tuple[Any, int]:
+        size = count * (8 if typecode == "q" else 1)
+        view = self.data[pos:pos + size]
+        if typecode == "q" and sys.byteorder == "big":
+            words = array("q", view)
+            words.byteswap()
+            return words, pos + size
+        return view.cast(typecode), pos + size
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @overload
+    def __getitem__(self, i: int) -> PyracketAst: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[PyracketAst]: ...
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return list(self.nodes(range(*i.indices(len(self)))))
+        return next(self.nodes((i,)))
+
+    def __iter__(self) -> Iterator[PyracketAst]:
+        return self.nodes(range(len(self)))
+
+    def nodes(self, indexes: Iterable[int]) -> Iterator[PyracketAst]:
+        """Decode the nodes at ``indexes``."""
+        kinds, bases, refs = self.kinds, self.bases, self.refs
+        starts, ends, lines = self.starts, self.ends, self.lines
+        heap, values = self.heap, self.values
+        for i in indexes:
+            kind, base, ref = kinds[i], bases[i], refs[i]
+            span = Span(starts[i], ends[i], lines)
+            if kind == Kind.INTEGER and base & INLINE:
+                yield IntegerAst(span, RkInteger(BASES[base ^ INLINE], ref))
+            elif kind == Kind.INEXACT_REAL:
+                yield InexactRealAst(span, RkInexactReal(bits_float(ref)))
+            elif kind in AST_CLASSES:
+                value = values.get(ref)
+                if value is None:
+                    value, _ = DECODERS[kind](base, heap, ref)
+                    values[ref] = value
+                yield AST_CLASSES[kind](span, value)
+            else:
+                yield BooleanAst(span, kind == Kind.TRUE)
+
+    def close(self) -> None:
+        """Release the views of the data and unmap the file, if any."""
+        for view in (self.starts, self.ends, self.refs, self.kinds,
+                     self.bases, self.heap, self.data):
+            if isinstance(view, memoryview):
+                view.release()
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+
+    def __enter__(self) -> "AstDump":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def loads(data: bytes) -> AstDump:
+    return AstDump(data)
+
+def load(path: Union[str, os.PathLike]) -> AstDump:
+    """Map the dump at ``path``. Nothing is decoded until it is indexed."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return AstDump(mapped, mapped)
+    except ValueError:
+        mapped.close()
+        raise
@@ -0,0 +1,173 @@
+"""Top-level forms kept in parallel typed arrays instead of one object each.
+
+Node ``i`` of an ``AstStore`` is described by ``kinds[i]``, ``bases[i]``,
+``starts[i]``, ``ends[i]`` and ``refs[i]``; what ``refs[i]`` points into
+depends on its kind:
+
+- ``STRING``: ``strings``
+- ``INTEGER``: ``integers``, or ``big_integers`` at ``-refs[i] - 1`` for
+  values that don't fit in 64 bits
+- ``RATIONAL``: ``numerators`` and ``denominators``, or ``big_rationals``
+- ``INEXACT_REAL``: ``floats``
+- ``FLOATING_POINT``, ``COMPLEX`` and ``INEXACT_COMPLEX``: ``others``, as
+  value objects
+- ``TRUE`` and ``FALSE``: nothing
+
+Indexing the store builds the ``PyracketAst`` for a node, with a ``Span``
+that shares the store's ``LineIndex``. Scanning a column, say
+``sum(store.integers)``, builds no nodes at all.
+"""
+from array import array
+from collections.abc import Sequence
+from enum import IntEnum
+from typing import Any, Iterator, overload
+
+from pyracket.semantics.numbers import Base, RkExact, RkExactComplex, \
+    RkInexactReal, RkInteger, RkRational
+from pyracket.syntax.expr_ast import BooleanAst, ExactComplexAst, \
+    ExactFloatingPointAst, InexactComplexAst, InexactRealAst, IntegerAst, \
+    PyracketAst, RationalAst, StringAst
+from pyracket.syntax.span import LineIndex, Span
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+class Kind(IntEnum):
+    FALSE = 0
+    TRUE = 1
+    STRING = 2
+    INTEGER = 3
+    RATIONAL = 4
+    FLOATING_POINT = 5
+    COMPLEX = 6
+    INEXACT_REAL = 7
+    INEXACT_COMPLEX = 8
+
+
+def fits(*values: int) -> bool:
+    return all(INT64_MIN <= v <= INT64_MAX for v in values)
+
+
+class AstStore(Sequence[PyracketAst]):
+    """A read-only sequence of top-level forms stored column by column."""
+
+    def __init__(self) -> None:
+        self.kinds = array("B")
+        # the base of a number's value, 0 for other nodes
+        self.bases = array("B")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.refs = array("q")
+        self.strings: list[str] = []
+        self.integers = array("q")
+        self.big_integers: list[int] = []
+        self.numerators = array("q")
+        self.denominators = array("q")
+        self.big_rationals: list[tuple[int, int]] = []
+        self.floats = array("d")
+        self.others: list[Any] = []
+        self.lines = LineIndex()
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @overload
+    def __getitem__(self, i: int) -> PyracketAst: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[PyracketAst]: ...
+
+    def __getitem__(self, i: int | slice) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        kind, ref = self.kinds[i], self.refs[i]
+        span = Span(self.starts[i], self.ends[i], self.lines)
+        if kind <= Kind.TRUE:
+            return BooleanAst(span, kind == Kind.TRUE)
+        elif kind == Kind.STRING:
+            return StringAst(span, self.strings[ref])
+        elif kind == Kind.INEXACT_REAL:
+            return InexactRealAst(span, RkInexactReal(self.floats[ref]))
+        elif kind == Kind.INEXACT_COMPLEX:
+            return InexactComplexAst(span, self.others[ref])
+        base = Base(self.bases[i])
+        if kind == Kind.INTEGER:
+            value = (self.integers[ref] if ref >= 0
+                     else self.big_integers[-ref - 1])
+            return IntegerAst(span, RkInteger(base, value))
+        elif kind == Kind.RATIONAL:
+            num, den = ((self.numerators[ref], self.denominators[ref])
+                        if ref >= 0 else self.big_rationals[-ref - 1])
+            return RationalAst(span, RkRational(base, num, den))
+        elif kind == Kind.FLOATING_POINT:
+            return ExactFloatingPointAst(span, self.others[ref])
+        return ExactComplexAst(span, self.others[ref])
+
+    def kinds_of(self, kind: Kind) -> Iterator[int]:
+        """The indexes of the nodes of one kind."""
+        return (i for i, k in enumerate(self.kinds) if k == kind)
+
+    def append(self, form: PyracketAst) -> None:
+        """Add a form, which may come from any parser mode."""
+        kind, value = kind_of(form), form.value
+        ref = 0
+        if kind == Kind.STRING:
+            ref = len(self.strings)
+            self.strings.append(value)
+        elif kind == Kind.INTEGER:
+            if fits(value.value):
+                ref = len(self.integers)
+                self.integers.append(value.value)
+            else:
+                ref = -len(self.big_integers) - 1
+                self.big_integers.append(value.value)
+        elif kind == Kind.RATIONAL:
+            if fits(value.numerator, value.denominator):
+                ref = len(self.numerators)
+                self.numerators.append(value.numerator)
+                self.denominators.append(value.denominator)
+            else:
+                ref = -len(self.big_rationals) - 1
+                self.big_rationals.append(
+                    (value.numerator, value.denominator))
+        elif kind == Kind.INEXACT_REAL:
+            ref = len(self.floats)
+            self.floats.append(value.value)
+        elif kind >= Kind.FLOATING_POINT:
+            ref = len(self.others)
+            self.others.append(value)
+        self.kinds.append(kind)
+        self.bases.append(base_of(form))
+        self.starts.append(form.meta.start_pos)
+        self.ends.append(form.meta.end_pos)
+        self.refs.append(ref)
+
+
+def kind_of(form: PyracketAst) -> Kind:
+    if isinstance(form, BooleanAst):
+        return Kind.TRUE if form.value else Kind.FALSE
+    elif isinstance(form, StringAst):
+        return Kind.STRING
+    elif isinstance(form, IntegerAst):
+        return Kind.INTEGER
+    elif isinstance(form, RationalAst):
+        return Kind.RATIONAL
+    elif isinstance(form, ExactFloatingPointAst):
+        return Kind.FLOATING_POINT
+    elif isinstance(form, ExactComplexAst):
+        return Kind.COMPLEX
+    elif isinstance(form, InexactRealAst):
+        return Kind.INEXACT_REAL
+    elif isinstance(form, InexactComplexAst):
+        return Kind.INEXACT_COMPLEX
+    raise TypeError(f"Can't store {type(form).__name__}")
+
+
+def base_of(form: PyracketAst) -> int:
+    """The base of an exact number's value (of its real part, for a
+    complex), or 0 for other nodes, inexact numbers included."""
+    value = form.value
+    if isinstance(value, RkExactComplex):
+        value = value.real
+    return value.base.value if isinstance(value, RkExact) else 0
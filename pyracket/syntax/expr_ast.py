@@ -1,100 +1,202 @@
+import re
 import sys
 from dataclasses import dataclass, replace
-from typing import TypeVar, Optional, cast
+from functools import wraps
+from typing import Any, Callable, TypeVar, Optional, cast
 
-from lark import ast_utils, Token
+from lark import Token
 from lark.visitors import Transformer, v_args
 from lark.tree import Meta
 
-from pyracket.semantics.numbers import Base, RkNumber, RkExact, RkExactReal, \
-    RkInteger, RkRational, RkExactFloatingPoint, RkExactComplex, PosOrNeg
+from pyracket.semantics.arithmetic import float_of
+from pyracket.semantics.numbers import BASE_TO_ALPH, Base, RkNumber, RkExact, RkExactReal, \
+    RkInteger, RkRational, RkExactFloatingPoint, RkExactComplex, PosOrNeg, \
+    RkInexact, RkInexactReal, RkInexactComplex
+from pyracket.syntax.span import Span
 
 this_module = sys.modules[__name__]
 
-class PyracketAst[T](ast_utils.Ast, ast_utils.WithMeta):
-    meta: Meta
+Position = Meta | Span
+
+class PyracketAst[T]:
+    """A node with its value and where it came from, as a Lark ``Meta`` or a
+    compact ``Span``.
+
+    The nodes are slotted. They don't derive from Lark's ``ast_utils``
+    classes, which have no ``__slots__`` and would bring a ``__dict__`` back.
+    They aren't frozen, because interning and reparsing update them in place.
+    """
+    __slots__ = ()
+
+    meta: Position
     value: T
 
-@dataclass
-class StringAst(PyracketAst[str], ast_utils.AsList):
-    meta: Meta
+    def __lark_meta__(self) -> Position:
+        return self.meta
+
+@dataclass(slots=True)
+class StringAst(PyracketAst[str]):
+    meta: Position
     value: str
 
-    def __init__(self, meta: Meta, value: str) -> None:
-        super().__init__()
+    def __init__(self, meta: Position, value: str) -> None:
         self.meta = meta
-        self.value = "".join(value)
+        self.value = value if isinstance(value, str) else "".join(value)
 
 
-@dataclass
+@dataclass(slots=True)
 class BooleanAst(PyracketAst[bool]):
-    meta: Meta
+    meta: Position
     value: bool
 
 T = TypeVar("T")
 N = TypeVar("N", bound=RkNumber)
 E = TypeVar("E", bound=RkExact)
 R = TypeVar("R", bound=RkExactReal)
+I = TypeVar("I", bound=RkInexact)
 
 class NumberAst[N](PyracketAst[N]):
+    __slots__ = ()
+
     value: N
 
 
 class ExactAst[E](NumberAst[E]):
-    pass
+    __slots__ = ()
 
 
 class ExactRealAst[R](ExactAst[R]):
-    meta: Meta
+    __slots__ = ()
+
+    meta: Position
     value: R
 
 
-@dataclass
+@dataclass(slots=True)
 class IntegerAst(ExactRealAst[RkInteger]):
-    meta: Meta
+    meta: Position
     value: RkInteger
 
 
-@dataclass
+@dataclass(slots=True)
 class RationalAst(ExactRealAst[RkRational]):
-    meta: Meta
+    meta: Position
     value: RkRational
 
 
-@dataclass
+@dataclass(slots=True)
 class ExactFloatingPointAst(ExactRealAst[RkExactFloatingPoint]):
-    meta: Meta
+    meta: Position
     value: RkExactFloatingPoint
 
 
-@dataclass
+@dataclass(slots=True)
 class ExactComplexAst(NumberAst[RkExactComplex]):
-    meta: Meta
+    meta: Position
     value: RkExactComplex
 
 
+class InexactAst[I](NumberAst[I]):
+    __slots__ = ()
+
+
+@dataclass(slots=True)
+class InexactRealAst(InexactAst[RkInexactReal]):
+    meta: Position
+    value: RkInexactReal
+
+
+@dataclass(slots=True)
+class InexactComplexAst(InexactAst[RkInexactComplex]):
+    meta: Position
+    value: RkInexactComplex
+
+
+def edge_of(child: Token | PyracketAst) -> Position:
+    """Where a child of a rule is. Tokens from the lexer always have their
+    positions, so a ``Token`` can stand in for a ``Meta``."""
+    if isinstance(child, PyracketAst):
+        return child.meta
+    return cast(Meta, child)
+
+def meta_of(children: tuple[Any, ...]) -> Meta:
+    """Builds the Meta spanning the Tokens and ASTs among a rule's children.
+
+    Lark won't pass Meta to a transformer that runs inline in the LALR parser,
+    so the callbacks work out their own positions instead.
+    """
+    positioned = [c for c in children if isinstance(c, (Token, PyracketAst))]
+    first = edge_of(positioned[0])
+    last = edge_of(positioned[-1])
+    meta = Meta()
+    meta.empty = False
+    meta.line = first.line
+    meta.column = first.column
+    meta.start_pos = first.start_pos
+    meta.end_line = last.end_line
+    meta.end_column = last.end_column
+    meta.end_pos = last.end_pos
+    return meta
+
+def span_of(children: tuple[Any, ...]) -> Span:
+    """Like ``meta_of``, but builds a ``Span`` with no line index yet."""
+    positioned = [c for c in children if isinstance(c, (Token, PyracketAst))]
+    return Span(edge_of(positioned[0]).start_pos,
+                edge_of(positioned[-1]).end_pos)
+
+def inline_meta(f: Callable[..., T]) -> Callable[..., T]:
+    """Like ``v_args(inline=True, meta=True)``, but usable inline in LALR."""
+    @wraps(f)
+    def with_meta(self, *children: Any) -> T:
+        return f(self, self.position_of(children), *children)
+    return v_args(inline=True)(with_meta)
+
+def to_sign(sign: Optional[str]) -> Optional[PosOrNeg]:
+    return PosOrNeg(sign) if sign else None
+
 def integer_ast_of(
-        meta: Meta, base: Base, sign: Optional[PosOrNeg], digits: str
+        meta: Position, base: Base, sign: Optional[PosOrNeg], digits: str
 ) -> IntegerAst:
     value = int(digits, base.value)
     value = -value if sign is PosOrNeg.NEG else value
     return IntegerAst(meta, RkInteger(base, value))
 
 def rational_ast_of(
-        meta: Meta, sign: Optional[PosOrNeg], value: RkRational
+        meta: Position, sign: Optional[PosOrNeg], value: RkRational
 ) -> RationalAst:
     if sign is PosOrNeg.NEG:
         value = RkRational(value.base, -value.numerator, value.denominator)
     return RationalAst(meta, value)
 
-def unsigned_floating_point_of(
-        base: Base, before: str, after: str, exp: Optional[RkInteger],
+def rational_of(
+        base: Base, sign: Optional[PosOrNeg], numeral: str
+) -> RkRational:
+    num, den = numeral.split("/")
+    value = int(num, base.value)
+    value = -value if sign is PosOrNeg.NEG else value
+    return RkRational(base, value, int(den, base.value))
+
+def floating_point_re(base: Base) -> re.Pattern[str]:
+    digit = f"[{BASE_TO_ALPH[base]}]"
+    marks = "sl" if base is Base.HEXADECIMAL else "sldef"
+    return re.compile(
+        rf"({digit}*)\.({digit}*)(?:[{marks}]([+-]?{digit}+))?", re.IGNORECASE)
+
+FLOATING_POINT_RES = {base: floating_point_re(base) for base in Base}
+
+def floating_point_of(
+        base: Base, sign: Optional[PosOrNeg], numeral: str
 ) -> RkExactFloatingPoint:
-    eff_exp = RkInteger(base, (exp.value if exp else 0) - len(after))
-    return RkExactFloatingPoint(base, PosOrNeg.POS, before + after, eff_exp)
+    match = FLOATING_POINT_RES[base].fullmatch(numeral)
+    assert match, numeral
+    before, after, exp = match.groups()
+    eff_exp = RkInteger(
+        base, (int(exp, base.value) if exp else 0) - len(after))
+    return RkExactFloatingPoint(
+        base, sign or PosOrNeg.POS, before + after, eff_exp)
 
 def exact_floating_point_ast_of(
-        meta: Meta, sign: Optional[PosOrNeg], unsigned: RkExactFloatingPoint
+        meta: Position, sign: Optional[PosOrNeg], unsigned: RkExactFloatingPoint
 ) -> ExactFloatingPointAst:
     with_sign = RkExactFloatingPoint(
         unsigned.base,
@@ -104,9 +206,22 @@ def exact_floating_point_ast_of(
     )
     return ExactFloatingPointAst(meta, with_sign)
 
+def signed_real_of(
+        meta: Position, sign: Optional[PosOrNeg], unsigned: ExactRealAst
+) -> ExactRealAst:
+    if isinstance(unsigned, IntegerAst):
+        value = unsigned.value
+        if sign is PosOrNeg.NEG:
+            value = value.negate()
+        return IntegerAst(meta, value)
+    elif isinstance(unsigned, RationalAst):
+        return rational_ast_of(meta, sign, unsigned.value)
+    else:
+        return exact_floating_point_ast_of(meta, sign, unsigned.value)
+
 def exact_complex_of(
         base: Base,
-        meta: Meta,
+        meta: Position,
         real: Optional[ExactRealAst],
         sign: str,
         imag: Optional[ExactRealAst],
@@ -117,57 +232,96 @@ def exact_complex_of(
         imag_val = imag_val.negate()
     return ExactComplexAst(meta, RkExactComplex(real_val, imag_val))
 
-
-def to_exp(base: Base, sign: Optional[PosOrNeg], digits: str) -> RkInteger:
-    mult = -1 if (sign or PosOrNeg.POS) == PosOrNeg.NEG else 1
-    num = mult * int(digits, base.value)
-    return RkInteger(base, num)
+def special_of(numeral: str) -> float:
+    """The value of ``+inf.0``, ``-nan.f`` and the like."""
+    value = float(numeral[:4])
+    # every NaN is the same; keep no sign or payload
+    return value if value == value else float("nan")
+
+def inexact_real_of(
+        meta: Position, sign: Optional[str], unsigned: ExactRealAst
+) -> InexactRealAst:
+    value = float_of(unsigned.value)
+    return InexactRealAst(meta, RkInexactReal(-value if sign == "-" else value))
+
+def inexact_complex_of(
+        meta: Position,
+        real: Optional[InexactRealAst],
+        sign: str,
+        imag: Optional[ExactRealAst],
+) -> InexactComplexAst:
+    real_val = real.value.value if real else 0.0
+    imag_val = float_of(imag.value) if imag else 1.0
+    return InexactComplexAst(meta, RkInexactComplex(
+        real_val, -imag_val if sign == "-" else imag_val))
+
+
+ESCAPE_RE = re.compile(
+    r"\\(?:"
+    r"([abefnrtv\"'\\])"
+    r"|([0-7]{1,3})"
+    r"|x([0-9a-fA-F]{1,2})"
+    r"|u([dD][89abAB][0-9a-fA-F]{2})\\u([dD][c-fC-F][0-9a-fA-F]{2})"
+    r"|u([0-9a-fA-F]{1,4})"
+    r"|U([0-9a-fA-F]{1,8})"
+    r")"
+)
+
+def unescape_match(m: re.Match[str]) -> str:
+    char, octal, hex_byte, high, low, unicode, wide = m.groups()
+    if char:
+        return escape_chars[char]
+    elif octal:
+        return chr(int(octal, 8))
+    elif hex_byte:
+        return chr(int(hex_byte, 16))
+    elif high:
+        return chr(0x10000
+                   + ((int(high, 16) - 0xD800) << 10)
+                   + (int(low, 16) - 0xDC00))
+    elif unicode:
+        return chr(int(unicode, 16))
+    else:
+        try:
+            return chr(int(wide, 16))
+        except ValueError:
+            raise ValueError(f"Invalid escape sequence: {m.group()}")
+
+def decode_string(literal: str) -> str:
+    """The value of a string literal, quotes included, in a single pass."""
+    body = literal[1:-1]
+    if "\\" not in body:
+        return body
+    return ESCAPE_RE.sub(unescape_match, body)
 
 class ToAstExpr(Transformer):
-    def TRUE(self, _: str):
-        return True
-
-    def FALSE(self, _: str):
-        return False
-
-    def UNESCAPED_CHAR(self, s: str) -> str:
-        return s[0]
-
-    def ESCAPED_CHAR(self, s: str) -> str:
-        assert s[0] == "\\"
-        if s[1] in escape_chars:
-            return escape_chars[s[1]]
-        elif s[1] in "01234567":
-            return chr(int(s[1:], 8))
-        elif s[1] == "x":
-            return chr(int(s[2:], 16))
-        elif s[1] == "u" and "\\u" not in s[2:]:
-            return chr(int(s[2:], 16))
-        elif s[1] == "u" and s[6:8] == "\\u":
-            if 0xD800 <= int(s[2:6]) <= 0xDBFF and 0xDC00 <= int(
-                    s[6:8]) <= 0xDFFF:
-                return chr(int(s[2:6], 16)) + chr(int(s[6:8], 16))
-            else:
-                raise ValueError(f"Invalid escape sequence: {s}")
-        elif s[1] == "U":
-            return chr(int(s[2:], 16))
-        else:
-            raise ValueError(f"Invalid escape sequence: {s}")
+    """Builds the AST, either over a parse tree or inline in the LALR parser.
+
+    Terminal callbacks would run as LALR lexer callbacks, which must return
+    Tokens, so terminals are converted by the rule callbacks instead.
+
+    With ``spans=True`` the nodes get a ``Span`` instead of a ``Meta``.
+    """
+
+    def __init__(self, spans: bool = False) -> None:
+        super().__init__()
+        self.position_of = span_of if spans else meta_of
+
+    @v_args(inline=True)
+    def file(self, *forms: PyracketAst) -> list[PyracketAst]:
+        return list(forms)
 
     @v_args(inline=True)
-    def opt_sign(self, sign: Optional[PosOrNeg]) -> Optional[PosOrNeg]:
-        return sign
-
-    def SIGN(self, s) -> PosOrNeg:
-        return PosOrNeg(s[0])
-        
-    @v_args(inline=True, meta=True)
-    def boolean(self, meta, value: bool) -> BooleanAst:
-        return BooleanAst(meta, value)
+    def expr(self, value: PyracketAst) -> PyracketAst:
+        return value
+
+    @inline_meta
+    def boolean(self, meta, value: Token) -> BooleanAst:
+        return BooleanAst(meta, value.type == "TRUE")
     
-    @v_args(inline=True, meta=True)
-    def string(self, meta, *values: str) -> StringAst:
-        return StringAst(meta, "".join(values))
+    @inline_meta
+    def string(self, meta, literal: str) -> StringAst:
+        return StringAst(meta, decode_string(literal))
     
     @v_args(inline=True)
     def number[N](self, value: NumberAst[N]) -> NumberAst[N]:
@@ -185,73 +339,73 @@ class ToAstExpr(Transformer):
     def exact_integer(self, value: IntegerAst) -> IntegerAst:
         return value
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_integer_2(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg], digits: str
+            self, meta: Position, _: str, sign: Optional[str], digits: str
     ) -> IntegerAst:
-        return integer_ast_of(meta, Base.BINARY, sign, digits)
+        return integer_ast_of(meta, Base.BINARY, to_sign(sign), digits)
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_integer_8(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg], digits: str
+            self, meta: Position, _: str, sign: Optional[str], digits: str
     ) -> IntegerAst:
-        return integer_ast_of(meta, Base.OCTAL, sign, digits)
+        return integer_ast_of(meta, Base.OCTAL, to_sign(sign), digits)
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_integer_10(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg], digits: str
+            self, meta: Position, _: str, sign: Optional[str], digits: str
     ) -> IntegerAst:
-        return integer_ast_of(meta, Base.DECIMAL, sign, digits)
+        return integer_ast_of(meta, Base.DECIMAL, to_sign(sign), digits)
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_integer_16(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg], digits: str
+            self, meta: Position, _: str, sign: Optional[str], digits: str
     ) -> IntegerAst:
-        return integer_ast_of(meta, Base.HEXADECIMAL, sign, digits)
+        return integer_ast_of(meta, Base.HEXADECIMAL, to_sign(sign), digits)
 
     @v_args(inline=True)
     def exact_rational(self, value: RationalAst) -> RationalAst:
         return value
     
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_rational_2(
-        self, meta: Meta, _: str, sign: Optional[PosOrNeg], value: RkRational
+        self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> RationalAst:
-        return rational_ast_of(meta, sign, value)
+        return RationalAst(meta, rational_of(Base.BINARY, to_sign(sign), numeral))
     
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_rational_8(
-        self, meta: Meta, _: str, sign: Optional[PosOrNeg], value: RkRational
+        self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> RationalAst:
-        return rational_ast_of(meta, sign, value)
+        return RationalAst(meta, rational_of(Base.OCTAL, to_sign(sign), numeral))
     
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_rational_10(
-        self, meta: Meta, _: str, sign: Optional[PosOrNeg], value: RkRational
+        self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> RationalAst:
-        return rational_ast_of(meta, sign, value)
+        return RationalAst(meta, rational_of(Base.DECIMAL, to_sign(sign), numeral))
     
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_rational_16(
-        self, meta: Meta, _: str, sign: Optional[PosOrNeg], value: RkRational
+        self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> RationalAst:
-        return rational_ast_of(meta, sign, value)
+        return RationalAst(meta, rational_of(Base.HEXADECIMAL, to_sign(sign), numeral))
 
-    @v_args(inline=True)
-    def unsigned_rational_2(self, num: str, den: str) -> RkRational:
-        return RkRational(Base.BINARY, int(num, 2), int(den, 2))
+    @inline_meta
+    def unsigned_rational_2(self, meta: Position, numeral: str) -> RationalAst:
+        return RationalAst(meta, rational_of(Base.BINARY, None, numeral))
 
-    @v_args(inline=True)
-    def unsigned_rational_8(self, num: str, den: str) -> RkRational:
-        return RkRational(Base.OCTAL, int(num, 8), int(den, 8))
+    @inline_meta
+    def unsigned_rational_8(self, meta: Position, numeral: str) -> RationalAst:
+        return RationalAst(meta, rational_of(Base.OCTAL, None, numeral))
 
-    @v_args(inline=True)
-    def unsigned_rational_10(self, num: str, den: str) -> RkRational:
-        return RkRational(Base.DECIMAL, int(num, 10), int(den, 10))
+    @inline_meta
+    def unsigned_rational_10(self, meta: Position, numeral: str) -> RationalAst:
+        return RationalAst(meta, rational_of(Base.DECIMAL, None, numeral))
 
-    @v_args(inline=True)
-    def unsigned_rational_16(self, num: str, den: str) -> RkRational:
-        return RkRational(Base.HEXADECIMAL, int(num, 16), int(den, 16))
+    @inline_meta
+    def unsigned_rational_16(self, meta: Position, numeral: str) -> RationalAst:
+        return RationalAst(meta, rational_of(Base.HEXADECIMAL, None, numeral))
 
     @v_args(inline=True)
     def exact_floating_point(
@@ -260,153 +414,281 @@ class ToAstExpr(Transformer):
     ) -> ExactFloatingPointAst:
         return value
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_floating_point_2(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg],
-            unsigned: RkExactFloatingPoint
+            self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> ExactFloatingPointAst:
-        return exact_floating_point_ast_of(meta, sign, unsigned)
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.BINARY, to_sign(sign), numeral))
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_floating_point_8(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg],
-            unsigned: RkExactFloatingPoint
+            self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> ExactFloatingPointAst:
-        return exact_floating_point_ast_of(meta, sign, unsigned)
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.OCTAL, to_sign(sign), numeral))
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_floating_point_10(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg],
-            unsigned: RkExactFloatingPoint
+            self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> ExactFloatingPointAst:
-        return exact_floating_point_ast_of(meta, sign, unsigned)
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.DECIMAL, to_sign(sign), numeral))
 
-    @v_args(inline=True, meta=True)
+    @inline_meta
     def exact_floating_point_16(
-            self, meta: Meta, _: str, sign: Optional[PosOrNeg],
-            unsigned: RkExactFloatingPoint
+            self, meta: Position, _: str, sign: Optional[str], numeral: str
     ) -> ExactFloatingPointAst:
-        return exact_floating_point_ast_of(meta, sign, unsigned)
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.HEXADECIMAL, to_sign(sign), numeral))
 
-    @v_args(inline=True)
+    @inline_meta
     def unsigned_floating_point_2(
-            self, before: str, after: str,
-            exp: Optional[RkInteger]
-    ) -> RkExactFloatingPoint:
-        return unsigned_floating_point_of(Base.BINARY, before, after, exp)
-
+            self, meta: Position, numeral: str
+    ) -> ExactFloatingPointAst:
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.BINARY, None, numeral))
 
-    @v_args(inline=True)
+    @inline_meta
     def unsigned_floating_point_8(
-            self, before: str, after: str,
-            exp: Optional[RkInteger]
-    ) -> RkExactFloatingPoint:
-        return unsigned_floating_point_of(Base.OCTAL, before, after, exp)
+            self, meta: Position, numeral: str
+    ) -> ExactFloatingPointAst:
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.OCTAL, None, numeral))
 
-    @v_args(inline=True)
+    @inline_meta
     def unsigned_floating_point_10(
-            self, before: str, after: str, exp: Optional[RkInteger]
-    ) -> RkExactFloatingPoint:
-        return unsigned_floating_point_of(Base.DECIMAL, before, after, exp)
+            self, meta: Position, numeral: str
+    ) -> ExactFloatingPointAst:
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.DECIMAL, None, numeral))
 
-    @v_args(inline=True)
+    @inline_meta
     def unsigned_floating_point_16(
-            self, before: str, after: str,
-            exp: Optional[RkInteger]
-    ) -> RkExactFloatingPoint:
-        return unsigned_floating_point_of(Base.HEXADECIMAL, before, after, exp)
+            self, meta: Position, numeral: str
+    ) -> ExactFloatingPointAst:
+        return ExactFloatingPointAst(
+            meta, floating_point_of(Base.HEXADECIMAL, None, numeral))
 
     @v_args(inline=True)
-    def star_2(self, *args: Token):
-        return "".join([a.value for a in args])
+    def exact_complex(self, value: ExactComplexAst) -> ExactComplexAst:
+        return value
 
-    @v_args(inline=True)
-    def star_8(self, *args: Token):
-        return "".join([a.value for a in args])
+    @inline_meta
+    def exact_complex_2(
+            self,
+            meta: Position,
+            _: Optional[str],
+            real: Optional[ExactRealAst],
+            sign: str,
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> ExactComplexAst:
+        return exact_complex_of(Base.BINARY, meta, real, sign, imag)
 
-    @v_args(inline=True)
-    def star_10(self, *args: Token):
-        return "".join([a.value for a in args])
+    @inline_meta
+    def exact_complex_8(
+            self,
+            meta: Position,
+            _: Optional[str],
+            real: Optional[ExactRealAst],
+            sign: str,
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> ExactComplexAst:
+        return exact_complex_of(Base.OCTAL, meta, real, sign, imag)
 
-    @v_args(inline=True)
-    def star_16(self, *args: Token):
-        return "".join([a.value for a in args])
+    @inline_meta
+    def exact_complex_10(
+            self,
+            meta: Position,
+            _: Optional[str],
+            real: Optional[ExactRealAst],
+            sign: str,
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> ExactComplexAst:
+        return exact_complex_of(Base.DECIMAL, meta, real, sign, imag)
 
-    @v_args(inline=True)
-    def plus_2(self, *args: Token):
-        return "".join([a.value for a in args])
+    @inline_meta
+    def exact_complex_16(
+            self,
+            meta: Position,
+            _: Optional[str],
+            real: Optional[ExactRealAst],
+            sign: str,
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> ExactComplexAst:
+        return exact_complex_of(Base.HEXADECIMAL, meta, real, sign, imag)
 
-    @v_args(inline=True)
-    def plus_8(self, *args: Token):
-        return "".join([a.value for a in args])
+    @inline_meta
+    def signed_real_2(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> ExactRealAst:
+        return signed_real_of(meta, to_sign(sign), unsigned)
+
+    @inline_meta
+    def signed_real_8(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> ExactRealAst:
+        return signed_real_of(meta, to_sign(sign), unsigned)
+
+    @inline_meta
+    def signed_real_10(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> ExactRealAst:
+        return signed_real_of(meta, to_sign(sign), unsigned)
+
+    @inline_meta
+    def signed_real_16(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> ExactRealAst:
+        return signed_real_of(meta, to_sign(sign), unsigned)
 
     @v_args(inline=True)
-    def plus_10(self, *args: Token):
-        return "".join([a.value for a in args])
+    def unsigned_real_2(self, value: ExactRealAst) -> ExactRealAst:
+        return value
 
     @v_args(inline=True)
-    def plus_16(self, *args: Token):
-        return "".join([a.value for a in args])
+    def unsigned_real_8(self, value: ExactRealAst) -> ExactRealAst:
+        return value
 
     @v_args(inline=True)
-    def exp_2(self, _: str, sign: Optional[PosOrNeg], power: str) -> RkInteger:
-        return to_exp(Base.BINARY, sign, power)
+    def unsigned_real_10(self, value: ExactRealAst) -> ExactRealAst:
+        return value
 
     @v_args(inline=True)
-    def exp_8(self, _: str, sign: Optional[PosOrNeg], power: str) -> RkInteger:
-        return to_exp(Base.OCTAL, sign, power)
+    def unsigned_real_16(self, value: ExactRealAst) -> ExactRealAst:
+        return value
+
+    @inline_meta
+    def unsigned_integer_2(self, meta: Position, digits: str) -> IntegerAst:
+        return integer_ast_of(meta, Base.BINARY, None, digits)
+
+    @inline_meta
+    def unsigned_integer_8(self, meta: Position, digits: str) -> IntegerAst:
+        return integer_ast_of(meta, Base.OCTAL, None, digits)
+
+    @inline_meta
+    def unsigned_integer_10(self, meta: Position, digits: str) -> IntegerAst:
+        return integer_ast_of(meta, Base.DECIMAL, None, digits)
+
+    @inline_meta
+    def unsigned_integer_16(self, meta: Position, digits: str) -> IntegerAst:
+        return integer_ast_of(meta, Base.HEXADECIMAL, None, digits)
 
     @v_args(inline=True)
-    def exp_10(self, _: str, sign: Optional[PosOrNeg], power: str) -> RkInteger:
-        return to_exp(Base.DECIMAL, sign, power)
+    def inexact[I](self, value: InexactAst[I]) -> InexactAst[I]:
+        return value
+
+    @inline_meta
+    def inexact_special(self, meta: Position, numeral: str) -> InexactRealAst:
+        return InexactRealAst(meta, RkInexactReal(special_of(numeral)))
 
     @v_args(inline=True)
-    def exp_16(self, _: str, sign: Optional[PosOrNeg], power: str) -> RkInteger:
-        return to_exp(Base.HEXADECIMAL, sign, power)
+    def inexact_real(self, value: InexactRealAst) -> InexactRealAst:
+        return value
+
+    @inline_meta
+    def inexact_real_2(
+            self, meta: Position, _: str, value: InexactRealAst
+    ) -> InexactRealAst:
+        return InexactRealAst(meta, value.value)
+
+    @inline_meta
+    def inexact_real_8(
+            self, meta: Position, _: str, value: InexactRealAst
+    ) -> InexactRealAst:
+        return InexactRealAst(meta, value.value)
+
+    @inline_meta
+    def inexact_real_10(
+            self, meta: Position, _: str, value: InexactRealAst
+    ) -> InexactRealAst:
+        return InexactRealAst(meta, value.value)
+
+    @inline_meta
+    def inexact_real_16(
+            self, meta: Position, _: str, value: InexactRealAst
+    ) -> InexactRealAst:
+        return InexactRealAst(meta, value.value)
 
     @v_args(inline=True)
-    def exact_complex(self, value: ExactComplexAst) -> ExactComplexAst:
+    def inexact_complex(self, value: InexactComplexAst) -> InexactComplexAst:
         return value
 
-    @v_args(inline=True, meta=True)
-    def exact_complex_2(
+    @inline_meta
+    def inexact_complex_2(
             self,
-            meta: Meta,
-            real: Optional[RationalAst],
+            meta: Position,
+            _: str,
+            real: Optional[InexactRealAst],
             sign: str,
-            imag: Optional[RationalAst],
-    ) -> ExactComplexAst:
-        return exact_complex_of(Base.BINARY, meta, real, sign, imag)
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> InexactComplexAst:
+        return inexact_complex_of(meta, real, sign, imag)
 
-    @v_args(inline=True, meta=True)
-    def exact_complex_8(
+    @inline_meta
+    def inexact_complex_8(
             self,
-            meta: Meta,
-            real: Optional[RationalAst],
+            meta: Position,
+            _: str,
+            real: Optional[InexactRealAst],
             sign: str,
-            imag: Optional[RationalAst],
-    ) -> ExactComplexAst:
-        return exact_complex_of(Base.OCTAL, meta, real, sign, imag)
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> InexactComplexAst:
+        return inexact_complex_of(meta, real, sign, imag)
 
-    @v_args(inline=True, meta=True)
-    def exact_complex_10(
+    @inline_meta
+    def inexact_complex_10(
             self,
-            meta: Meta,
-            real: Optional[RationalAst],
+            meta: Position,
+            _: str,
+            real: Optional[InexactRealAst],
             sign: str,
-            imag: Optional[RationalAst],
-    ) -> ExactComplexAst:
-        return exact_complex_of(Base.DECIMAL, meta, real, sign, imag)
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> InexactComplexAst:
+        return inexact_complex_of(meta, real, sign, imag)
 
-    @v_args(inline=True, meta=True)
-    def exact_complex_16(
+    @inline_meta
+    def inexact_complex_16(
             self,
-            meta: Meta,
-            real: Optional[RationalAst],
+            meta: Position,
+            _: str,
+            real: Optional[InexactRealAst],
             sign: str,
-            imag: Optional[RationalAst],
-    ) -> ExactComplexAst:
-        return exact_complex_of(Base.HEXADECIMAL, meta, real, sign, imag)
+            imag: Optional[ExactRealAst],
+            _i: str,
+    ) -> InexactComplexAst:
+        return inexact_complex_of(meta, real, sign, imag)
+
+    @inline_meta
+    def signed_inexact_2(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> InexactRealAst:
+        return inexact_real_of(meta, sign, unsigned)
+
+    @inline_meta
+    def signed_inexact_8(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> InexactRealAst:
+        return inexact_real_of(meta, sign, unsigned)
+
+    @inline_meta
+    def signed_inexact_10(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> InexactRealAst:
+        return inexact_real_of(meta, sign, unsigned)
+
+    @inline_meta
+    def signed_inexact_16(
+            self, meta: Position, sign: Optional[str], unsigned: ExactRealAst
+    ) -> InexactRealAst:
+        return inexact_real_of(meta, sign, unsigned)
 
 
 
@@ -419,6 +701,7 @@ escape_chars = {
     "n": "\n",
     "r": "\r",
     "t": "\t",
+    "v": "\v",
     '"': '"',
     "'": "'",
     "\\": "\\",
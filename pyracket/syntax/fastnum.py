@@ -0,0 +1,165 @@
+"""A scanner for single numeric literals that doesn't go through Lark.
+
+``parse_number`` accepts the same literals as the ``number`` rule of
+expr.lark and returns the same ASTs, but with one regex match and a few int()
+calls. It returns None for anything else, including literals the grammar
+would reject, so callers fall back to the Lark parser for error reporting.
+
+Inexact decimal reals go straight to ``float()``, which rounds correctly;
+everything else inexact is read as the exact value it is written as and
+rounded once by ``float_of``, as the grammar's callbacks do.
+"""
+import re
+from typing import Optional
+
+from lark.tree import Meta
+
+from pyracket.semantics.arithmetic import float_of
+from pyracket.semantics.numbers import BASE_TO_ALPH, Base, PosOrNeg, \
+    RkExactComplex, RkExactReal, RkInexactComplex, RkInexactReal, RkInteger
+from pyracket.syntax.expr_ast import ExactComplexAst, ExactFloatingPointAst, \
+    InexactComplexAst, InexactRealAst, IntegerAst, NumberAst, RationalAst, \
+    floating_point_of, rational_of, special_of, to_sign
+from pyracket.syntax.span import Span
+
+# the exactness and base letters, either way round
+PREFIX_RE = re.compile(
+    r"(?:#([ei])(?:#([bodx]))?|#([bodx])(?:#([ei]))?)?", re.IGNORECASE)
+
+SPECIAL_RE = re.compile(r"[+-](?:inf|nan)\.[0f]", re.IGNORECASE)
+
+# the exponent marks of decimal numerals, as float() writes them
+EXPONENT_MARKS = str.maketrans("sldfSLDF", "eeeeeeee")
+
+PREFIX_TO_BASE = {
+    "b": Base.BINARY,
+    "o": Base.OCTAL,
+    "d": Base.DECIMAL,
+    "x": Base.HEXADECIMAL,
+}
+
+def number_re(base: Base) -> re.Pattern[str]:
+    digit = f"[{BASE_TO_ALPH[base]}]"
+    marks = "sl" if base is Base.HEXADECIMAL else "sldef"
+    unsigned_real = (
+        rf"{digit}+/{digit}+"
+        rf"|(?:{digit}+\.{digit}*|\.{digit}+)(?:[{marks}][+-]?{digit}+)?"
+        rf"|{digit}+"
+    )
+    return re.compile(
+        rf"(?:([+-]?)({unsigned_real}))?"
+        rf"(?:([+-])({unsigned_real})?(i))?",
+        re.IGNORECASE)
+
+NUMBER_RES = {base: number_re(base) for base in Base}
+
+def real_of(
+        base: Base, sign: Optional[PosOrNeg], numeral: str
+) -> RkExactReal:
+    if "/" in numeral:
+        return rational_of(base, sign, numeral)
+    elif "." in numeral:
+        return floating_point_of(base, sign, numeral)
+    value = int(numeral, base.value)
+    return RkInteger(base, -value if sign is PosOrNeg.NEG else value)
+
+def whole_text_meta(text: str) -> Meta:
+    meta = Meta()
+    meta.empty = False
+    meta.line = meta.end_line = 1
+    meta.column = 1
+    meta.end_column = len(text) + 1
+    meta.start_pos = 0
+    meta.end_pos = len(text)
+    return meta
+
+def parse_number(text: str, spans: bool = False) -> Optional[NumberAst]:
+    """The AST for a numeric literal, or None to use the Lark parser.
+    With ``spans`` it gets a ``Span`` with no line index instead of a
+    ``Meta``."""
+    prefix = PREFIX_RE.match(text)
+    assert prefix
+    exactness, letter = (prefix.group(1) or prefix.group(4),
+                         prefix.group(2) or prefix.group(3))
+    base = PREFIX_TO_BASE[letter.lower()] if letter else Base.DECIMAL
+    inexact = exactness is not None and exactness in "iI"
+    if inexact or not prefix.end():
+        special = SPECIAL_RE.match(text, prefix.end())
+        if special:
+            return special_number_of(text, spans, base, special)
+    match = NUMBER_RES[base].fullmatch(text, prefix.end())
+    if not match:
+        return None
+    if inexact:
+        return inexact_of(text, spans, base, match)
+    real_sign, real, imag_sign, imag, i = match.groups()
+    try:
+        if not i:
+            if real is None:
+                return None
+            value = real_of(base, to_sign(real_sign), real)
+            meta = Span(0, len(text)) if spans else whole_text_meta(text)
+            if isinstance(value, RkInteger):
+                return IntegerAst(meta, value)
+            elif "/" in real:
+                return RationalAst(meta, value)
+            return ExactFloatingPointAst(meta, value)
+        real_value = (real_of(base, to_sign(real_sign), real)
+                      if real is not None else RkInteger(base, 0))
+        imag_value = (real_of(base, None, imag)
+                      if imag is not None else RkInteger(base, 1))
+        if imag_sign == "-":
+            imag_value = imag_value.negate()
+        return ExactComplexAst(
+            Span(0, len(text)) if spans else whole_text_meta(text),
+            RkExactComplex(real_value, imag_value))
+    except ValueError:
+        # e.g. a zero denominator; let the parser report it
+        return None
+
+def special_number_of(
+        text: str, spans: bool, base: Base, special: re.Match[str]
+) -> Optional[NumberAst]:
+    """An infinity or NaN, alone or as the real part of an inexact complex
+    number, which must then have a prefix."""
+    value = special_of(special.group())
+    meta = Span(0, len(text)) if spans else whole_text_meta(text)
+    if special.end() == len(text):
+        return InexactRealAst(meta, RkInexactReal(value))
+    match = NUMBER_RES[base].fullmatch(text, special.end())
+    if not special.start() or not match or match.group(2) is not None \
+            or not match.group(5):
+        return None
+    _, _, imag_sign, imag, _ = match.groups()
+    try:
+        imag_value = (float_of(real_of(base, None, imag))
+                      if imag is not None else 1.0)
+    except ValueError:
+        return None
+    return InexactComplexAst(meta, RkInexactComplex(
+        value, -imag_value if imag_sign == "-" else imag_value))
+
+def inexact_of(
+        text: str, spans: bool, base: Base, match: re.Match[str]
+) -> Optional[NumberAst]:
+    real_sign, real, imag_sign, imag, i = match.groups()
+    meta = Span(0, len(text)) if spans else whole_text_meta(text)
+    try:
+        if not i:
+            if real is None:
+                return None
+            elif base is Base.DECIMAL and "/" not in real:
+                value = float(real.translate(EXPONENT_MARKS))
+            else:
+                value = float_of(real_of(base, None, real))
+            return InexactRealAst(
+                meta, RkInexactReal(-value if real_sign == "-" else value))
+        real_value = (float_of(real_of(base, None, real))
+                      if real is not None else 0.0)
+        imag_value = (float_of(real_of(base, None, imag))
+                      if imag is not None else 1.0)
+        return InexactComplexAst(meta, RkInexactComplex(
+            -real_value if real_sign == "-" else real_value,
+            -imag_value if imag_sign == "-" else imag_value))
+    except ValueError:
+        return None
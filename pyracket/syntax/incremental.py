@@ -0,0 +1,110 @@
+"""Reparsing only the top-level forms that a list of text edits touches.
+
+Top-level forms follow each other with nothing in between. Lexing from the
+start of a form that begins with ``"`` or ``#``, or that follows a string,
+doesn't depend on the text before it (see ``stream``). So ``reparse`` starts
+again at the last such form before the edits and stops at the first piece
+after them that starts where such a form did in the old text. From there on
+the text and the lexer state are what they were, and only the positions of
+the old forms change.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, Optional, Sequence
+
+from pyracket.syntax.expr_ast import PyracketAst
+
+
+from pyracket.syntax.span import Span
+from pyracket.syntax.stream import Piece, pieces_from
+
+Edit = tuple[int, int, str]
+
+
+def start_pos(form: PyracketAst) -> int:
+    return form.meta.start_pos
+
+def edit_window(edits: Iterable[Edit]) -> Optional[tuple[int, int, int]]:
+    """``(start, old_end, new_end)`` such that the edits only change the text
+    in ``[start, old_end)`` of the old text, which becomes ``[start,
+    new_end)`` of the new one. None if there are no edits."""
+    window = None
+    for offset, deleted, inserted in edits:
+        start, old_end, new_end = window or (offset, offset, offset)
+        end = max(new_end, offset + deleted)
+        window = (min(start, offset), old_end + end - new_end,
+                  end - deleted + len(inserted))
+    return window
+
+def restart_index(forms: Sequence[PyracketAst], text: str, start: int) -> int:
+    """The index of the first form to parse again for an edit at ``start``.
+    The form that ends at ``start`` is included unless it is a string, since
+    an insertion there could extend it."""
+    i = bisect_right(forms, start - 1, key=start_pos) - 1
+    if i >= 0 and text[start_pos(forms[i])] == '"' \
+            and forms[i].meta.end_pos == start:
+        return i + 1
+    while i > 0 and text[start_pos(forms[i])] not in '"#' \
+            and text[start_pos(forms[i - 1])] != '"':
+        i -= 1
+    return max(i, 0)
+
+def shift_tail(forms: Sequence[PyracketAst], j: int, delta: int, piece: Piece) -> None:
+    """Move the forms from ``j`` on, the first of which starts where
+    ``piece`` does in the new text, by ``delta`` characters."""
+    first = forms[j].meta
+    if isinstance(first, Span):
+        # lines and columns come from the index, which is already updated
+        for k in range(j, len(forms)):
+            meta = forms[k].meta
+            meta.start_pos += delta
+            meta.end_pos += delta
+        return
+    line, d_line, d_column = \
+        first.line, piece.line - first.line, piece.column - first.column
+    k = j
+    # only the forms on the line the tail starts on move sideways
+    while k < len(forms) and forms[k].meta.line == line:
+        meta = forms[k].meta
+        meta.column += d_column
+        if meta.end_line == line:
+            meta.end_column += d_column
+        k += 1
+    for k in range(j, len(forms)):
+        meta = forms[k].meta
+        meta.start_pos += delta
+        meta.end_pos += delta
+        if d_line:
+            meta.line += d_line
+            meta.end_line += d_line
+
+def reparse(
+        parse_piece: Callable[[Piece], list[PyracketAst]],
+        forms: list[PyracketAst],
+        text: str,
+        edits: Iterable[Edit],
+) -> list[PyracketAst]:
+    window = edit_window(edits)
+    if window is None:
+        return forms
+    start, old_end, new_end = window
+    delta = new_end - old_end
+    i = restart_index(forms, text, start)
+    if i == 0:
+        pieces = pieces_from(text)
+    else:
+        before = forms[i - 1].meta
+        pieces = pieces_from(
+            text, before.end_pos, before.end_line, before.end_column)
+    new_forms: list[PyracketAst] = []
+    j = len(forms)
+    for piece in pieces:
+        c = piece.start_pos
+        if c >= new_end and text[c] in '"#':
+            k = bisect_left(forms, c - delta, lo=i, key=start_pos)
+            if k < len(forms) and start_pos(forms[k]) == c - delta:
+                j = k
+                shift_tail(forms, j, delta, piece)
+                break
+        new_forms.extend(parse_piece(piece))
+    forms[i:j] = new_forms
+    return forms
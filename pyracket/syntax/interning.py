@@ -0,0 +1,63 @@
+"""Sharing equal literal values between the ASTs of a parser.
+
+The values are strings and frozen number dataclasses, so they are their own
+keys in the intern table, and sharing them is safe.
+"""
+from typing import Any, Hashable, Iterable, Optional, TypeVar, cast
+
+from pyracket.semantics.numbers import RkExactComplex, RkExactFloatingPoint, \
+    RkInexactComplex, RkInexactReal, RkInteger, RkRational
+from pyracket.syntax.expr_ast import PyracketAst
+
+T = TypeVar("T")
+
+# Long strings are rarely repeated and would be kept alive by the table.
+MAX_STRING_LENGTH = 256
+
+
+# The inexact numbers compare as Racket's eqv? does, so 0.0 and -0.0 are
+# kept apart.
+INTERNED_NUMBERS = (
+    RkInteger, RkRational, RkExactFloatingPoint, RkExactComplex,
+    RkInexactReal, RkInexactComplex)
+
+
+def value_key(value: Any) -> Optional[Hashable]:
+    """The intern table key for ``value``, or None if it isn't interned.
+    Booleans aren't, since ``True == 1`` would make them collide."""
+    if type(value) is str:
+        return value if len(value) <= MAX_STRING_LENGTH else None
+    elif type(value) in INTERNED_NUMBERS:
+        return cast(Hashable, value)
+    return None
+
+
+class Interner:
+    """A bounded table of canonical literal values.
+
+    Calling it with a value returns the first equal value it was called with.
+    The table holds at most ``max_size`` values and is emptied when it is
+    full, so it follows whichever literals are common at the moment without
+    the bookkeeping of an LRU.
+    """
+
+    def __init__(self, max_size: int = 1 << 16) -> None:
+        self.max_size = max_size
+        self.table: dict[Hashable, Any] = {}
+
+    def __call__(self, value: T) -> T:
+        key = value_key(value)
+        if key is None:
+            return value
+        canonical = self.table.get(key)
+        if canonical is None:
+            if len(self.table) >= self.max_size:
+                self.table.clear()
+            self.table[key] = canonical = value
+        return canonical
+
+    def intern_values(self, asts: Iterable[PyracketAst]) -> None:
+        """Replace the value of each AST with its canonical copy."""
+        for ast in asts:
+            # every concrete node class has a value slot
+            ast.value = self(ast.value)  # type: ignore[misc]
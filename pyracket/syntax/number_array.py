@@ -0,0 +1,217 @@
+"""Parsing columns of numeric literals into NumPy arrays.
+
+The literals are classified and converted a block at a time, on a matrix of
+their code points. Decimal integers of up to 18 digits, and decimals with a
+point whose digits fit in 53 bits and whose exponent is at most 22, are
+handled there. Those floats are correctly rounded by one multiplication or
+division, since both operands are exact doubles. As objects, any decimal with
+a point is built from the columns found there, without a regex. The rest (other bases,
+rationals, complex numbers, prefixes, long numerals) go through
+``fastnum.parse_number`` one at a time.
+
+NumPy is only needed here, and is imported with this module.
+"""
+from typing import Any, Callable
+
+import numpy as np
+
+from pyracket.semantics.arithmetic import float_of, integer, ratio
+from pyracket.semantics.numbers import Base, PosOrNeg, RkExactFloatingPoint, \
+    RkExactReal, RkInexactReal, RkNumber
+from pyracket.syntax.columnar import INT64_MAX, fits
+from pyracket.syntax.fastnum import parse_number
+
+# Rows are classified this many at a time, to bound the size of the matrix.
+BLOCK = 1 << 16
+# Longer literals can't be in the fast classes, so they skip the matrix.
+MAX_WIDTH = 32
+MAX_DIGITS = 18
+MAX_EXACT_MANTISSA = 1 << 53
+MAX_EXACT_POWER = 22
+POWERS_OF_TEN = np.array([10.0 ** k for k in range(MAX_EXACT_POWER + 1)])
+POWERS_OF_TEN_INT = np.array([10 ** k for k in range(MAX_DIGITS + 1)])
+
+PLUS, MINUS, POINT, ZERO, LOWER_E = map(ord, "+-.0e")
+
+NEG, POS = PosOrNeg.NEG, PosOrNeg.POS
+
+# what an invalid cell holds, by dtype kind
+EMPTY = {"i": 0, "f": np.nan, "O": None}
+
+
+def parse_number_array(
+        strings: Any, dtype: Any = np.float64
+) -> tuple[np.ndarray, np.ndarray]:
+    """Parse each string as a numeric literal, into an array of ``dtype``
+    and a mask of the cells that held a literal of that type.
+
+    ``dtype`` is ``int64``, for exact integers that fit in it, ``float64``,
+    for reals rounded to the nearest double, or ``object``, for the
+    ``RkNumber``s themselves. Other cells are 0, NaN or None, and False in
+    the mask. ``strings`` is a sequence or a NumPy array of ``str`` or
+    ``bytes``; items that are neither are invalid.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in EMPTY or dtype.kind != "O" and dtype.itemsize != 8:
+        raise ValueError(f"Unsupported dtype {dtype}")
+    texts = text_array(strings)
+    values = np.full(len(texts), EMPTY[dtype.kind], dtype=dtype)
+    valid = np.zeros(len(texts), dtype=bool)
+    lengths = np.strings.str_len(texts)
+    short = np.flatnonzero((lengths > 0) & (lengths <= MAX_WIDTH))
+    done = np.zeros(len(texts), dtype=bool)
+    for start in range(0, len(short), BLOCK):
+        rows = short[start:start + BLOCK]
+        block = texts[rows].astype(f"U{lengths[rows].max()}")
+        fill_block(block, lengths[rows], rows, dtype, values, valid, done)
+    convert = ITEM_CONVERTERS[dtype.kind]
+    for i in np.flatnonzero(~done):
+        text = texts[i]
+        number = parse_number(str(text)) if text else None
+        value = convert(number.value) if number is not None else None
+        if value is not None:
+            values[i] = value
+            valid[i] = True
+    return values, valid
+
+
+def text_array(strings: Any) -> np.ndarray:
+    if isinstance(strings, np.ndarray) and strings.dtype.kind == "U":
+        return strings.ravel()
+    elif isinstance(strings, np.ndarray) and strings.dtype.kind == "S":
+        return strings.ravel().astype(str)
+    return np.array(
+        [s if isinstance(s, str)
+         else s.decode("utf-8", "replace") if isinstance(s, bytes)
+         else "" for s in strings],
+        dtype=str)
+
+
+def fill_block(
+        texts: np.ndarray,
+        lengths: np.ndarray,
+        rows: np.ndarray,
+        dtype: np.dtype,
+        values: np.ndarray,
+        valid: np.ndarray,
+        done: np.ndarray,
+) -> None:
+    """Convert the rows of one block that are in the fast classes, and mark
+    them done.
+
+    The code points are laid out a column at a time, as a (width, rows)
+    matrix, so that each step works on long contiguous vectors.
+    """
+    width = texts.dtype.itemsize // 4
+    wide = texts.view(np.uint32).reshape(len(texts), width).T
+    # the fast classes are ASCII, so the rest of the work is on bytes
+    ascii = ~np.any(wide > 0x7F, axis=0)
+    codes = np.ascontiguousarray(wide, dtype=np.uint8)
+    columns = np.arange(width)[:, None]
+    inside = columns < lengths
+
+    digits = codes - np.uint8(ZERO)
+    is_digit = (digits < 10) & inside
+    is_point = codes == POINT
+    is_e = (codes | np.uint8(0x20)) == LOWER_E
+    is_sign = (codes == PLUS) | (codes == MINUS)
+
+    points = is_point.sum(axis=0)
+    marks = is_e.sum(axis=0)
+    has_sign = is_sign[0]
+    # where the mantissa ends, and where the exponent's sign would be
+    mark_at = np.where(marks > 0, np.argmax(is_e, axis=0), lengths)
+    point_at = np.where(points > 0, np.argmax(is_point, axis=0), mark_at)
+    exp_sign_at = np.minimum(mark_at + 1, width - 1)
+    exp_sign = np.take_along_axis(codes, exp_sign_at[None, :], axis=0)[0]
+    has_exp_sign = ((exp_sign == PLUS) | (exp_sign == MINUS)) \
+        & (marks > 0) & (mark_at + 1 < lengths)
+
+    allowed = (is_digit | is_point | is_e
+               | (is_sign & (columns == 0))
+               | (is_sign & (columns == exp_sign_at) & has_exp_sign))
+    mantissa_digits = mark_at - has_sign - points
+    exp_digits = np.where(marks > 0, lengths - mark_at - 1 - has_exp_sign, 0)
+    well_formed = (
+        ascii & ~np.any(inside & ~allowed, axis=0)
+        & (points <= 1) & (marks <= 1) & (point_at <= mark_at)
+        & (mantissa_digits >= 1) & (mantissa_digits <= MAX_DIGITS)
+        # an exponent needs a point before it and a digit after it
+        & ((marks == 0) | ((points == 1) & (exp_digits >= 1)
+                           & (exp_digits <= 4))))
+    is_int = well_formed & (points == 0)
+    is_float = well_formed & (points == 1)
+
+    in_mantissa = is_digit & (columns < mark_at)
+    in_exponent = is_digit & (columns > mark_at)
+    mantissa = np.zeros(len(texts), dtype=np.int64)
+    exponent = np.zeros(len(texts), dtype=np.int64)
+    for j in range(width):
+        column = digits[j].astype(np.int64)
+        mantissa = np.where(in_mantissa[j], mantissa * 10 + column, mantissa)
+        exponent = np.where(in_exponent[j], exponent * 10 + column, exponent)
+    negative = codes[0] == MINUS
+    power = (np.where(has_exp_sign & (exp_sign == MINUS), -exponent, exponent)
+             - np.where(points > 0, mark_at - point_at - 1, 0))
+
+    if dtype.kind == "i":
+        # a decimal with a point is an integer if its fraction is all zeros
+        scale = POWERS_OF_TEN_INT[np.minimum(np.abs(power), MAX_DIGITS)]
+        whole = np.where(power >= 0, mantissa * scale, mantissa // scale)
+        take = is_int | (is_float & (np.abs(power) <= MAX_DIGITS) & (
+            np.where(power >= 0, mantissa <= INT64_MAX // scale,
+                     mantissa % scale == 0)))
+        block_values: Any = np.where(negative, -whole, whole)
+        # the rest of the decimals with a point have a fraction
+        rejected = rows[is_float & ~take & (np.abs(power) <= MAX_DIGITS)
+                        & (power < 0)]
+        done[rejected] = True
+    elif dtype.kind == "f":
+        take = is_int | (is_float & (mantissa < MAX_EXACT_MANTISSA)
+                         & (np.abs(power) <= MAX_EXACT_POWER))
+        scale = POWERS_OF_TEN[np.minimum(np.abs(power), MAX_EXACT_POWER)]
+        magnitude = np.where(power >= 0, mantissa * scale, mantissa / scale)
+        # an exact zero has no sign
+        block_values = np.where(negative & (mantissa != 0), -magnitude,
+                                magnitude)
+    else:
+        take = is_int | is_float
+        signed = np.where(negative, -mantissa, mantissa)
+        block_values = np.empty(len(texts), dtype=object)
+        block_values[is_int] = [integer(v) for v in signed[is_int].tolist()]
+        block_values[is_float] = [
+            RkExactFloatingPoint(
+                Base.DECIMAL, NEG if minus else POS,
+                text[sign:end].replace(".", ""), integer(exp))
+            for text, minus, sign, end, exp in zip(
+                texts[is_float].tolist(), negative[is_float].tolist(),
+                has_sign[is_float].tolist(), mark_at[is_float].tolist(),
+                power[is_float].tolist())]
+    taken = rows[take]
+    values[taken] = block_values[take]
+    valid[taken] = done[taken] = True
+
+
+def int64_of(value: RkNumber) -> Any:
+    if not isinstance(value, RkExactReal):
+        return None
+    num, den = ratio(value)
+    if num % den or not fits(num // den):
+        return None
+    return num // den
+
+def float64_of(value: RkNumber) -> Any:
+    if isinstance(value, RkInexactReal):
+        return value.value
+    elif isinstance(value, RkExactReal):
+        return float_of(value)
+    return None
+
+def object_of(value: RkNumber) -> Any:
+    return value
+
+ITEM_CONVERTERS: dict[str, Callable[[RkNumber], Any]] = {
+    "i": int64_of,
+    "f": float64_of,
+    "O": object_of,
+}
@@ -0,0 +1,181 @@
+"""A content-addressed cache of parses, in memory and on disk.
+
+An entry is keyed by a hash of the grammar, the binary format version, the
+start symbol and the text, so a changed grammar or format can never serve a
+stale parse. Entries are stored as ``binary`` dumps: in memory, in an LRU of
+the most recent ones, and on disk, one file per entry under ``cache_dir()``.
+
+Several processes may share a directory. Files are written under a
+temporary name and renamed into place, so a reader sees a whole entry or
+none; an entry that goes missing or can't be read is just a miss.
+"""
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from pyracket.syntax import PyracketParser, cache_dir, read_expr_grammar
+from pyracket.syntax.binary import VERSION, AstDump, dumps, loads
+from pyracket.syntax.expr_ast import PyracketAst
+
+SUFFIX = ".rkast"
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+
+class ParseCache:
+    """``parse_ast`` for ``parser``, answered from the cache when it can be.
+
+    ``memory_entries`` is the number of parses kept in memory and
+    ``max_disk_bytes`` the size the directory is kept under. When a write
+    takes it over, the least recently used files are removed until it is
+    back to three quarters of that. ``directory=None`` keeps no files.
+
+    The forms of a cached parse have ``Span``s, whatever the parser gives,
+    and each call returns new ones. Parses that fail aren't cached.
+    """
+
+    def __init__(
+            self,
+            parser: PyracketParser,
+            directory: Union[str, os.PathLike, None] = None,
+            max_disk_bytes: int = 256 << 20,
+            memory_entries: int = 256,
+    ) -> None:
+        self.parser = parser
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_entries = memory_entries
+        self.memory: OrderedDict[str, AstDump] = OrderedDict()
+        self.stats = CacheStats()
+        # found by listing the directory when first needed
+        self.disk_bytes: Optional[int] = None
+        self.hasher = hashlib.sha256(
+            f"{read_expr_grammar()}\0{VERSION}\0".encode())
+
+    @classmethod
+    def in_cache_dir(cls, parser: PyracketParser, **options) -> "ParseCache":
+        """A cache with its files in the ``asts`` folder of ``cache_dir()``."""
+        return cls(parser, cache_dir() / "asts", **options)
+
+    def key(self, text: str, start: str) -> str:
+        hasher = self.hasher.copy()
+        hasher.update(f"{start}\0".encode())
+        hasher.update(text.encode("utf-8", "surrogatepass"))
+        return hasher.hexdigest()
+
+    def path_of(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / key[:2] / (key + SUFFIX)
+
+    def parse_ast(self, text: str, start: Optional[str] = None) -> PyracketAst:
+        start = start or self.parser.options.start[0]
+        key = self.key(text, start)
+        dump = self.memory.get(key)
+        if dump is not None:
+            self.memory.move_to_end(key)
+            self.stats.memory_hits += 1
+            forms = dump[:]
+        else:
+            forms = self.read(key)
+            if forms is not None:
+                self.stats.disk_hits += 1
+            else:
+                self.stats.misses += 1
+                result = self.parser.parse_ast(text, start)
+                forms = result if isinstance(result, list) else [result]
+                data = dumps(forms)
+                self.remember(key, loads(data))
+                self.write(key, data)
+                return result
+        self.parser.finish(forms, None)
+        return forms if start == "file" else forms[0]
+
+    def parse_path(self, path: Union[str, os.PathLike]) -> list[PyracketAst]:
+        """The top-level forms of a UTF-8 file, from the cache if its text
+        has been parsed before."""
+        text = Path(path).read_text(encoding="utf-8")
+        return self.parse_ast(text, start="file")
+
+    def remember(self, key: str, dump: AstDump) -> None:
+        self.memory[key] = dump
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def read(self, key: str) -> Optional[list[PyracketAst]]:
+        if self.directory is None:
+            return None
+        path = self.path_of(key)
+        try:
+            dump = loads(path.read_bytes())
+            # mark it as recently used, for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # left by a crash or another version; the parse replaces it
+            path.unlink(missing_ok=True)
+            return None
+        self.remember(key, dump)
+        return dump[:]
+
+    def write(self, key: str, data: bytes) -> None:
+        if self.directory is None:
+            return
+        path = self.path_of(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+        if self.disk_bytes is None:
+            self.disk_bytes = sum(size for _, _, size in self.entries())
+        else:
+            self.disk_bytes += len(data)
+        if self.disk_bytes > self.max_disk_bytes:
+            self.evict()
+
+    def entries(self) -> list[tuple[float, Path, int]]:
+        """The files in the directory, as (last used, path, size)."""
+        assert self.directory is not None
+        found = []
+        for path in self.directory.glob(f"*/*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, path, stat.st_size))
+        return found
+
+    def evict(self) -> None:
+        """Remove the least recently used files until the directory is
+        under three quarters of its limit."""
+        entries = sorted(self.entries())
+        total = sum(size for _, _, size in entries)
+        target = self.max_disk_bytes * 3 // 4
+        for _, path, size in entries:
+            if total <= target:
+                break
+            # another process may have got to it first
+            path.unlink(missing_ok=True)
+            total -= size
+        self.disk_bytes = total
+
+    def clear_memory(self) -> None:
+        self.memory.clear()
@@ -0,0 +1,89 @@
+"""A compact stand-in for Lark's ``Meta``.
+
+A ``Meta`` has a ``__dict__`` with eight entries, which makes it the largest
+part of a small AST node. A ``Span`` stores only the start and end offsets
+and works out lines and columns when asked, from a ``LineIndex`` that every
+span of a parse shares.
+"""
+from array import array
+from bisect import bisect_right
+from typing import Optional
+
+from lark.tree import Meta
+
+
+class LineIndex:
+    """The offsets at which the lines of a text start."""
+    __slots__ = ("starts",)
+
+    def __init__(self, text: str = "") -> None:
+        self.starts = array("q", [0])
+        self.add(text, 0)
+
+    def add(self, text: str, start_pos: int) -> None:
+        """Record the line breaks in ``text``, which starts at ``start_pos``
+        and follows everything added before."""
+        i = text.find("\n")
+        while i != -1:
+            self.starts.append(start_pos + i + 1)
+            i = text.find("\n", i + 1)
+
+    def reset(self, text: str) -> None:
+        """Index ``text`` instead, keeping the spans that share this index."""
+        del self.starts[1:]
+        self.add(text, 0)
+
+    def line_of(self, pos: int) -> int:
+        return bisect_right(self.starts, pos)
+
+    def column_of(self, pos: int) -> int:
+        return pos - self.starts[self.line_of(pos) - 1] + 1
+
+
+class Span:
+    """Start and end offsets with ``Meta``'s line and column attributes.
+
+    ``lines`` is filled in once the parse the span belongs to is finished.
+    """
+    __slots__ = ("start_pos", "end_pos", "lines")
+
+    empty = False
+
+    def __init__(
+            self, start_pos: int, end_pos: int,
+            lines: Optional[LineIndex] = None
+    ) -> None:
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+        self.lines = lines
+
+    def __repr__(self) -> str:
+        return f"Span({self.start_pos}, {self.end_pos})"
+
+    def __eq__(self, other: object) -> bool:
+        """Spans are equal to spans and ``Meta``s with the same offsets, so
+        ASTs read back from a dump compare equal to the ones dumped."""
+        if not isinstance(other, (Span, Meta)):
+            return NotImplemented
+        return (self.start_pos, self.end_pos) == (
+            other.start_pos, other.end_pos)
+
+    @property
+    def line(self) -> int:
+        assert self.lines is not None
+        return self.lines.line_of(self.start_pos)
+
+    @property
+    def column(self) -> int:
+        assert self.lines is not None
+        return self.lines.column_of(self.start_pos)
+
+    @property
+    def end_line(self) -> int:
+        assert self.lines is not None
+        return self.lines.line_of(self.end_pos)
+
+    @property
+    def end_column(self) -> int:
+        assert self.lines is not None
+        return self.lines.column_of(self.end_pos)
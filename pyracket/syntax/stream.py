@@ -0,0 +1,142 @@
+"""Splitting a source that arrives in chunks into independently parsable pieces.
+
+The grammar has no whitespace or delimiters between top-level forms, but a
+token can only contain a double quote if it is a string, and can only contain
+``#`` inside a string or as the second half of a prefix like ``#e#x``. So the
+text can be cut before every other ``"`` or ``#`` and after every string
+without splitting a token. Each piece is a short run of forms that can be
+parsed on its own and shifted to its place in the source.
+"""
+import codecs
+import io
+import mmap
+import os
+import re
+from dataclasses import dataclass
+from typing import IO, Iterable, Iterator, Optional, Union
+
+from lark.exceptions import UnexpectedInput
+from lark.tree import Meta
+
+from pyracket.syntax.span import Span
+
+Source = Union[str, os.PathLike, IO[str], Iterable[str]]
+
+CHUNK_SIZE = 1 << 16
+
+STRING_RE = re.compile(r'"(?:[^"\\]++|\\.)*+"', re.DOTALL)
+CUT_RE = re.compile(r'["#]')
+
+
+@dataclass(frozen=True)
+class Piece:
+    """A piece of the source and where it starts (1-based line and column)."""
+    text: str
+    start_pos: int
+    line: int
+    column: int
+
+
+def chunks_of(source: Source) -> Iterator[str]:
+    """A path is memory-mapped and decoded as UTF-8, a stream is read in
+    ``CHUNK_SIZE`` pieces, and anything else is taken to be an iterable of
+    strings."""
+    if isinstance(source, (str, os.PathLike)):
+        yield from mapped_chunks(source)
+    elif hasattr(source, "read"):
+        yield from iter(lambda: source.read(CHUNK_SIZE), "")
+    else:
+        yield from source
+
+def mapped_chunks(path: Union[str, os.PathLike]) -> Iterator[str]:
+    """The text of a UTF-8 file, decoded ``CHUNK_SIZE`` bytes at a time from a
+    read-only mapping, with newlines translated as ``open()`` would. Neither
+    the bytes nor the text of the whole file are ever held at once, and
+    parsing the same file again reads it from the page cache."""
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(), translate=True)
+    with open(path, "rb") as f:
+        # mmap refuses empty files
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                for start in range(0, len(mapped), CHUNK_SIZE):
+                    yield decoder.decode(mapped[start:start + CHUNK_SIZE])
+    yield decoder.decode(b"", final=True)
+
+def piece_end(buffer: str, pos: int) -> Optional[int]:
+    """Where the piece starting at ``pos`` ends, or None if that depends on
+    text after the end of ``buffer``."""
+    if buffer.startswith('"', pos):
+        match = STRING_RE.match(buffer, pos)
+        return match.end() if match else None
+    i = pos + 1
+    while match := CUT_RE.search(buffer, i):
+        i = match.start()
+        if buffer[i] == '"' or i - 2 < pos or buffer[i - 2] != "#":
+            return i
+        i += 1
+    return None
+
+def iter_pieces(chunks: Iterable[str]) -> Iterator[Piece]:
+    """The pieces of the concatenated chunks, in order. Only the text of the
+    unfinished piece is held between chunks."""
+    buffer = ""
+    start_pos, line, column = 0, 1, 1
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while (end := piece_end(buffer, pos)) is not None:
+            text = buffer[pos:end]
+            yield Piece(text, start_pos, line, column)
+            start_pos, line, column = advance(text, start_pos, line, column)
+            pos = end
+        buffer = buffer[pos:]
+    if buffer:
+        yield Piece(buffer, start_pos, line, column)
+
+def pieces_from(
+        text: str, pos: int = 0, line: int = 1, column: int = 1
+) -> Iterator[Piece]:
+    """The pieces of a complete ``text`` from ``pos``, which must be where a
+    piece starts, found as they are needed."""
+    while pos < len(text):
+        end = piece_end(text, pos) or len(text)
+        piece = Piece(text[pos:end], pos, line, column)
+        yield piece
+        pos, line, column = advance(piece.text, pos, line, column)
+
+def advance(
+        text: str, start_pos: int, line: int, column: int
+) -> tuple[int, int, int]:
+    newlines = text.count("\n")
+    if newlines:
+        return (start_pos + len(text), line + newlines,
+                len(text) - text.rfind("\n"))
+    return start_pos + len(text), line, column + len(text)
+
+def shift_meta(meta: Union[Meta, Span], piece: Piece) -> None:
+    """Move ``meta`` from the start of ``piece`` to its place in the source."""
+    if isinstance(meta, Span):
+        meta.start_pos += piece.start_pos
+        meta.end_pos += piece.start_pos
+        return
+    if meta.line == 1:
+        meta.column += piece.column - 1
+    if meta.end_line == 1:
+        meta.end_column += piece.column - 1
+    meta.line += piece.line - 1
+    meta.end_line += piece.line - 1
+    meta.start_pos += piece.start_pos
+    meta.end_pos += piece.start_pos
+
+def shift_error(error: UnexpectedInput, piece: Piece) -> None:
+    if error.line < 1:
+        # UnexpectedEOF has no position
+        return
+    if error.line == 1:
+        error.column += piece.column - 1
+    error.line += piece.line - 1
+    if error.pos_in_stream is not None:
+        error.pos_in_stream += piece.start_pos
@@ -0,0 +1,99 @@
+import io
+
+import pytest
+from hypothesis import assume, given, strategies as st
+from lark.exceptions import LarkError
+
+from pyracket.semantics.numbers import RkInexactComplex, RkInexactReal
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.binary import HEADER, dump, dumps, load, loads
+from pyracket.syntax.expr_ast import ExactComplexAst
+from pyracket.syntax.span import Span
+from tests.parser.iter_file_test import META_ATTRS, random_form
+
+TEXT = ('#true"a\nb"12#x-1/2#e-1.5"\n\n"#b1+i#false#o-7.1e2-3/4i'
+        '#x1.8s-2"λ"-0.0#i-0+nan.0#o#i1.1-4i')
+
+
+class TestBinary:
+    p = PyracketParser(start="file")
+    spans = PyracketParser(start="file", spans=True)
+
+    def assert_same_forms(self, loaded, forms):
+        assert len(loaded) == len(forms)
+        for l, f in zip(loaded, forms):
+            assert isinstance(l.meta, Span)
+            assert type(l) is type(f)
+            assert l.value == f.value
+            for attr in META_ATTRS:
+                assert getattr(l.meta, attr) == getattr(f.meta, attr), attr
+
+    def test_round_trip(self):
+        forms = self.spans.parse_ast(TEXT)
+        loaded = loads(dumps(forms))
+        assert loaded[:] == forms
+        self.assert_same_forms(loaded, forms)
+        assert isinstance(loaded[6], ExactComplexAst)
+        assert loaded[11].value.sign == forms[11].value.sign
+        # inexact reals are kept in the refs, bit for bit
+        assert [f.value for f in loaded[12:14]] == [
+            RkInexactReal(-0.0), RkInexactReal(float("nan"))]
+        assert loaded[-1].value == RkInexactComplex(1.125, -4.0)
+
+    def test_round_trip_from_meta(self):
+        forms = self.p.parse_ast(TEXT)
+        loaded = loads(dumps(forms))
+        assert loaded[:] == forms
+        self.assert_same_forms(loaded, forms)
+
+    def test_round_trip_from_store(self):
+        store = self.spans.parse_columnar([TEXT[:20], TEXT[20:]])
+        self.assert_same_forms(loads(dumps(store)), self.p.parse_ast(TEXT))
+
+    @given(st.lists(random_form, max_size=8).map("".join))
+    def test_random(self, text):
+        try:
+            forms = self.p.parse_ast(text)
+        except (LarkError, ValueError):
+            assume(False)
+        self.assert_same_forms(loads(dumps(forms)), forms)
+
+    def test_shares_equal_values(self):
+        forms = self.spans.parse_ast('"ab"1/2"ab"1/2#e1.5#e1.5')
+        loaded = loads(dumps(forms))
+        assert loaded.refs[0] == loaded.refs[2]
+        for i in (0, 1, 4):
+            assert loaded[i].value is loaded[i + (1 if i == 4 else 2)].value
+
+    def test_big_numbers(self):
+        big = 17 ** 40
+        forms = self.spans.parse_ast(f'-{big}"s"{big}/{big + 2}')
+        assert loads(dumps(forms))[:] == forms
+
+    def test_load_maps_file(self, tmp_path):
+        forms = self.spans.parse_ast(TEXT)
+        path = tmp_path / "forms.rkast"
+        dump(forms, path)
+        with load(path) as loaded:
+            self.assert_same_forms(loaded, forms)
+            first = loaded[1]
+        assert first.meta.end_line == 2
+        with pytest.raises(ValueError):
+            loaded[0]
+        buffer = io.BytesIO()
+        dump(forms, buffer)
+        assert buffer.getvalue() == path.read_bytes()
+
+    def test_empty(self):
+        assert len(loads(dumps([]))) == 0
+
+    def test_rejects_bad_data(self):
+        data = dumps(self.p.parse_ast(TEXT))
+        with pytest.raises(ValueError, match="Not a"):
+            loads(b"XXXX" + data[4:])
+        with pytest.raises(ValueError, match="version"):
+            loads(data[:4] + b"\x09\x00" + data[6:])
+        with pytest.raises(ValueError, match="Truncated"):
+            loads(data[:-1])
+        with pytest.raises(ValueError):
+            loads(data[:HEADER.size - 1])
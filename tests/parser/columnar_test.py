@@ -0,0 +1,69 @@
+from hypothesis import assume, given, strategies as st
+from lark.exceptions import LarkError
+
+from pyracket.semantics.numbers import Base
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.columnar import AstStore, Kind
+from pyracket.syntax.expr_ast import IntegerAst, RationalAst
+from tests.parser.iter_file_test import META_ATTRS, random_form
+
+TEXT = '#true"a\nb"12#x-1/2#e1.5"c"#b1+i#false#i-0+inf.0#x#i1-i'
+
+
+class TestColumnar:
+    p = PyracketParser(start="file", spans=True)
+    meta = PyracketParser(start="file")
+
+    def assert_same_forms(self, store, forms):
+        assert len(store) == len(forms)
+        for s, f in zip(store, forms):
+            assert type(s) is type(f)
+            assert s.value == f.value
+            for attr in META_ATTRS:
+                assert getattr(s.meta, attr) == getattr(f.meta, attr), attr
+
+    def test_same_as_parse_ast(self):
+        store = self.p.parse_columnar([TEXT[:9], TEXT[9:]])
+        self.assert_same_forms(store, self.p.parse_ast(TEXT))
+        assert list(store.kinds) == [
+            Kind.TRUE, Kind.STRING, Kind.INTEGER, Kind.RATIONAL,
+            Kind.FLOATING_POINT, Kind.STRING, Kind.COMPLEX, Kind.FALSE,
+            Kind.INEXACT_REAL, Kind.INEXACT_REAL, Kind.INEXACT_COMPLEX]
+        assert store[7].value is False
+        assert list(store.floats) == [-0.0, float("inf")]
+        assert [f.value for f in store[1:6:4]] == ["a\nb", "c"]
+
+    @given(st.lists(random_form, max_size=8).map("".join))
+    def test_random(self, text):
+        try:
+            forms = self.meta.parse_ast(text)
+        except (LarkError, ValueError):
+            assume(False)
+        self.assert_same_forms(self.p.parse_columnar([text]), forms)
+
+    def test_columns(self):
+        store = self.p.parse_columnar(['12#x-ff"s"3/4#b-10/11'])
+        assert list(store.integers) == [12, -255]
+        assert list(store.numerators) == [3, -2]
+        assert list(store.denominators) == [4, 3]
+        assert [store.bases[i] for i in store.kinds_of(Kind.INTEGER)] == [
+            Base.DECIMAL.value, Base.HEXADECIMAL.value]
+
+    def test_big_numbers(self):
+        big = 10 ** 30
+        store = self.p.parse_columnar([f'{big}"s"-{big}/3"s"1/{big + 1}'])
+        assert len(store.integers) == 0
+        assert store.big_integers == [big]
+        assert len(store.numerators) == 0
+        assert isinstance(store[0], IntegerAst)
+        assert store[0].value.value == big
+        assert isinstance(store[2], RationalAst)
+        assert store[2].value.numerator == -big
+        assert store[4].value.denominator == big + 1
+
+    def test_append_from_meta_parser(self):
+        store = AstStore()
+        for form in self.meta.parse_ast(TEXT):
+            store.append(form)
+        store.lines.add(TEXT, 0)
+        self.assert_same_forms(store, self.p.parse_ast(TEXT))
@@ -0,0 +1,45 @@
+from pyracket.semantics.numbers import Base, RkInteger
+from pyracket.syntax import PyracketParser, get_parser, grammar_cache_path, \
+    shared_parser
+from pyracket.syntax.expr_ast import BooleanAst, IntegerAst, StringAst
+
+
+class TestGetParser:
+
+    def test_shared_across_starts(self):
+        assert get_parser("number").parser is get_parser("string").parser
+        assert get_parser("number").parser is shared_parser()
+
+    def test_parses_from_start(self):
+        assert isinstance(get_parser("boolean").parse_ast("#true"), BooleanAst)
+        assert isinstance(get_parser("string").parse_ast('"a"'), StringAst)
+        result = get_parser("exact_integer").parse_ast("#x-ff")
+        assert isinstance(result, IntegerAst)
+        assert result.value == RkInteger(Base.HEXADECIMAL, -255)
+
+    def test_unknown_start(self):
+        try:
+            get_parser("nope")
+        except ValueError:
+            pass
+        else:
+            assert False, "expected ValueError"
+
+    def test_disk_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYRACKET_CACHE_DIR", str(tmp_path))
+        options = {"start": ["number"], "parser": "lalr"}
+        path = grammar_cache_path(options)
+        assert path.parent == tmp_path
+        assert not path.exists()
+        PyracketParser(start=["number"], cache=True)
+        assert path.exists()
+        cached = PyracketParser(start=["number"], cache=True)
+        result = cached.parse_ast("12")
+        assert isinstance(result, IntegerAst)
+        assert result.value == RkInteger(Base.DECIMAL, 12)
+        assert result.meta.end_pos == 2
+
+    def test_cache_key_depends_on_options(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYRACKET_CACHE_DIR", str(tmp_path))
+        assert (grammar_cache_path({"start": ["number"]})
+                != grammar_cache_path({"start": ["string"]}))
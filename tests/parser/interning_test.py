@@ -0,0 +1,50 @@
+from pyracket.semantics.numbers import Base, RkInteger
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.interning import Interner
+
+TEXT = '#true0"a"1/2#x1.8+2i0"a"1/2#x1.8+2i#true'
+
+
+class TestInterning:
+    p = PyracketParser(start=["file", "number"], intern=True)
+
+    def test_shares_equal_values(self):
+        forms = self.p.parse_ast(TEXT, start="file")
+        for first, second in zip(forms[1:5], forms[5:9]):
+            assert first.value is second.value
+            assert first.meta is not second.meta
+            assert first.meta.start_pos < second.meta.start_pos
+
+    def test_off_by_default(self):
+        forms = PyracketParser(start="file").parse_ast(TEXT)
+        assert forms[1].value == forms[5].value
+        assert forms[1].value is not forms[5].value
+
+    def test_fast_path_and_stream(self):
+        assert (self.p.parse_ast("#d#e-10", start="number").value
+                is self.p.parse_ast("-10", start="number").value)
+        forms = list(self.p.iter_file([TEXT]))
+        assert forms[1].value is forms[5].value
+        assert forms[3].value is forms[7].value
+
+    def test_distinguishes_bases(self):
+        forms = self.p.parse_ast("#x10#d16", start="file")
+        assert forms[0].value == RkInteger(Base.HEXADECIMAL, 16)
+        assert forms[1].value == RkInteger(Base.DECIMAL, 16)
+
+    def test_shared_table(self):
+        interner = Interner()
+        a = PyracketParser(start="number", intern=interner)
+        b = PyracketParser(start="number", intern=interner)
+        assert a.parse_ast("12").value is b.parse_ast("12").value
+
+    def test_bounded(self):
+        interner = Interner(max_size=2)
+        first = interner("a")
+        interner("b")
+        interner("c")
+        assert len(interner.table) == 1
+        assert interner("x" * 1000) is not None
+        assert len(interner.table) == 1
+        assert interner("c") == "c"
+        assert interner(first) is first
@@ -0,0 +1,115 @@
+import io
+
+import pytest
+from hypothesis import given, strategies as st
+from lark.exceptions import LarkError, UnexpectedInput
+
+from pyracket.syntax import PyracketParser, stream
+from tests.parser.numbers import random_inexact_literal, random_literal
+
+META_ATTRS = ("line", "column", "end_line", "end_column", "start_pos", "end_pos")
+
+
+@st.composite
+def random_string_literal(draw) -> str:
+    text = draw(st.text(alphabet=st.sampled_from('ab#"\\\n1+')))
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+random_form = st.one_of(
+    st.sampled_from(["#true", "#false"]),
+    random_string_literal(),
+    random_literal(),
+    random_inexact_literal(),
+    st.sampled_from(["+inf.0", "-nan.0", "#i-0"]),
+)
+
+@st.composite
+def chunked(draw, text: str) -> list[str]:
+    cuts = sorted(draw(st.lists(st.integers(0, len(text)), max_size=8)))
+    bounds = [0, *cuts, len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+class TestIterFile:
+    p = PyracketParser(start=["file", "number"])
+
+    def assert_same_forms(self, text, source):
+        try:
+            expected = self.p.parse_ast(text, start="file")
+        except (LarkError, ValueError):
+            with pytest.raises((LarkError, ValueError)):
+                list(self.p.iter_file(source))
+            return
+        actual = list(self.p.iter_file(source))
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert type(a) is type(e)
+            assert a.value == e.value
+            for attr in META_ATTRS:
+                assert getattr(a.meta, attr) == getattr(e.meta, attr), attr
+
+    @given(st.lists(random_form, max_size=6).flatmap(
+        lambda forms: st.tuples(st.just("".join(forms)),
+                                chunked("".join(forms)))))
+    def test_matches_whole_parse(self, text_and_chunks):
+        text, chunks = text_and_chunks
+        self.assert_same_forms(text, chunks)
+
+    def test_one_char_chunks(self):
+        text = '#e#x-ff"a\nb"#true1/2"\\""#b1+i.5'
+        self.assert_same_forms(text, iter(text))
+
+    def test_stream(self):
+        text = '#true"x"12' * 10000
+        forms = self.p.iter_file(io.StringIO(text))
+        assert next(forms).value is True
+        assert sum(1 for _ in forms) == 29999
+
+    def test_path(self, tmp_path):
+        path = tmp_path / "data.rkt"
+        path.write_text('"one\ntwo"#false', encoding="utf-8")
+        self.assert_same_forms(path.read_text(encoding="utf-8"), path)
+        self.assert_same_forms(path.read_text(encoding="utf-8"), str(path))
+
+    def test_error_position(self):
+        with pytest.raises(UnexpectedInput) as whole:
+            self.p.parse_ast('"a\nbc"#true1.5?', start="file")
+        with pytest.raises(UnexpectedInput) as info:
+            list(self.p.iter_file(['"a\nbc"#tr', "ue1.5?"]))
+        assert (info.value.line, info.value.column) == (2, 12)
+        assert info.value.line == whole.value.line
+        assert info.value.column == whole.value.column
+        assert info.value.pos_in_stream == whole.value.pos_in_stream
+
+
+class TestParsePath:
+    p = PyracketParser(start="file")
+
+    def assert_same_as_text(self, path):
+        expected = self.p.parse_ast(path.read_text(encoding="utf-8"))
+        actual = self.p.parse_path(path)
+        assert [type(a) for a in actual] == [type(e) for e in expected]
+        for a, e in zip(actual, expected):
+            assert a.value == e.value
+            for attr in META_ATTRS:
+                assert getattr(a.meta, attr) == getattr(e.meta, attr), attr
+
+    def test_small_chunks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(stream, "CHUNK_SIZE", 3)
+        path = tmp_path / "data.rkt"
+        path.write_text('"é€\U0001F600\n"#x-1f/2#true"\\u00e9"' * 20,
+                        encoding="utf-8")
+        self.assert_same_as_text(path)
+
+    def test_newlines_translated(self, tmp_path):
+        path = tmp_path / "data.rkt"
+        path.write_bytes(b'"a\r\nb\rc"12')
+        forms = self.p.parse_path(path)
+        assert forms[0].value == "a\nb\nc"
+        assert (forms[1].meta.line, forms[1].meta.column) == (3, 3)
+        self.assert_same_as_text(path)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.rkt"
+        path.write_bytes(b"")
+        assert self.p.parse_path(path) == []
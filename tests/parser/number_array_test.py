@@ -0,0 +1,103 @@
+import math
+
+import pytest
+from hypothesis import given, strategies as st
+
+np = pytest.importorskip("numpy")
+
+from pyracket.semantics.arithmetic import float_of, ratio
+from pyracket.semantics.numbers import RkExactReal, RkInexactReal, \
+    RkInteger, parse_number_array
+from pyracket.syntax.fastnum import parse_number
+from tests.parser.numbers import random_inexact_literal, random_literal
+
+decimal_cells = st.one_of(
+    st.integers(-10 ** 20, 10 ** 20).map(str),
+    st.floats(allow_nan=False, allow_infinity=False).map(repr)
+    .filter(lambda s: "." in s),
+    st.from_regex(r"[+-]?[0-9]{0,20}\.[0-9]{0,20}([eE][+-]?[0-9]{1,5})?",
+                  fullmatch=True),
+)
+cells = st.one_of(decimal_cells, random_literal(), random_inexact_literal(),
+                  st.text(max_size=6))
+
+
+def expected(text, kind):
+    """The cell as the per-item path gives it, or None if invalid."""
+    ast = parse_number(text)
+    if ast is None:
+        return None
+    value = ast.value
+    if kind == "float64":
+        if isinstance(value, RkInexactReal):
+            return value.value
+        return float_of(value) if isinstance(value, RkExactReal) else None
+    elif kind == "int64":
+        if not isinstance(value, RkExactReal):
+            return None
+        num, den = ratio(value)
+        return num // den if num % den == 0 and \
+            -2 ** 63 <= num // den < 2 ** 63 else None
+    return value
+
+
+def same_float(a, b):
+    return a == b and math.copysign(1, a) == math.copysign(1, b) \
+        or math.isnan(a) and math.isnan(b)
+
+
+class TestNumberArray:
+
+    @pytest.mark.parametrize("kind", ["float64", "int64", "object"])
+    @given(st.lists(cells, max_size=40))
+    def test_matches_per_item(self, kind, texts):
+        values, valid = parse_number_array(np.array(texts, dtype=str), kind)
+        assert values.dtype == np.dtype(kind)
+        for text, value, ok in zip(texts, values.tolist(), valid.tolist()):
+            want = expected(text, kind)
+            assert ok == (want is not None), text
+            if not ok:
+                continue
+            if kind == "float64":
+                assert same_float(value, want), text
+            else:
+                assert value == want, text
+
+    def test_decimal_floats_round_correctly(self):
+        rng = np.random.default_rng(0)
+        floats = rng.standard_normal(5000) * 10.0 ** rng.integers(-30, 30, 5000)
+        texts = [repr(f) for f in floats.tolist()] + [
+            "0.1", "-0.0", "1.", ".5", "9007199254740993.0", "1.5e22",
+            "123456789.123456789", "1.e-400"]
+        values, valid = parse_number_array(texts)
+        assert valid.all()
+        for text, value in zip(texts, values.tolist()):
+            assert same_float(value, float(text) or 0.0), text
+
+    def test_classes(self):
+        texts = ["12", "-3.0", "1.5", "#x1f", "1/2", "1+2i", "+inf.0",
+                 "1e5", "", "abc", "١٢"]
+        ints, int_ok = parse_number_array(texts, dtype=np.int64)
+        assert ints[int_ok].tolist() == [12, -3, 31]
+        floats, float_ok = parse_number_array(texts)
+        assert float_ok.tolist() == [True] * 5 + [False, True] + [False] * 4
+        assert np.isnan(floats[~float_ok]).all()
+        objects, object_ok = parse_number_array(texts, dtype=object)
+        assert object_ok.sum() == 7
+        assert objects[0] == RkInteger(objects[0].base, 12)
+        assert objects[-1] is None
+
+    def test_inputs(self):
+        expected_values = [1.0, 2.5]
+        for strings in (["1", "2.5"], np.array([b"1", b"2.5"]),
+                        np.array(["1", "2.5"], dtype=object)):
+            values, valid = parse_number_array(strings)
+            assert values.tolist() == expected_values
+        values, valid = parse_number_array(["1", None, 3])
+        assert valid.tolist() == [True, False, False]
+        values, valid = parse_number_array(["1" * 40, "2"], dtype="int64")
+        assert valid.tolist() == [False, True]
+
+    def test_rejects_other_dtypes(self):
+        with pytest.raises(ValueError):
+            parse_number_array(["1"], dtype=np.float32)
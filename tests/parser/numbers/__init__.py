@@ -22,6 +22,15 @@ def exact_prefixes(base:  Base) -> list[str]:
                 prefixes.append(base_prefix + exact_prefix)
     return prefixes
 
+def inexact_prefixes(base: Base) -> list[str]:
+    prefixes = []
+    for inexact_prefix in ["#i", "#I"]:
+        for base_prefix in BASE_PREFIXES[base.value]:
+            prefixes.append(inexact_prefix + base_prefix)
+            if base_prefix:
+                prefixes.append(base_prefix + inexact_prefix)
+    return prefixes
+
 def exp_mark(base: Base) -> list[str]:
     exp_marks = ["s", "S", "l", "L"]
     if base != Base.HEXADECIMAL:
@@ -53,13 +62,13 @@ def random_rational(draw, base: Base) -> tuple[RkRational, str]:
 @composite
 def random_floating_point(draw, base: Base, include_zero=True) -> tuple[RkExactFloatingPoint, str]:
     left, left_str = draw(random_signed_int(base))
-    right, right_str = draw(random_unsigned_int(base), include_zero=include_zero)
+    right, right_str = draw(random_unsigned_int(base, include_zero=include_zero))
     exp_num = None
     exp_mk = None
     exp_str = None
     if random.random() < 0.5:
         exp_mk = draw(st.sampled_from(exp_mark(base)))
-        exp_num, exp_str = draw(random_signed_int, base)
+        exp_num, exp_str = draw(random_signed_int(base))
     if left_str.startswith("-"):
         left = -left
         left_str = left_str[1:]
@@ -67,13 +76,14 @@ def random_floating_point(draw, base: Base, include_zero=True) -> tuple[RkExactF
     else:
         sign = PosOrNeg.POS
 
-    exp = RkInteger(base, exp_num or 0)
+    exp = RkInteger(base, (exp_num or 0) - len(right_str))
     if exp_mk and exp_num:
         exp_str_all = exp_mk + exp_str
     else:
         exp_str_all = ""
+    sign_str = "-" if sign is PosOrNeg.NEG else ""
     return (RkExactFloatingPoint(base, sign, left_str + right_str, exp),
-            left_str + "." + right_str + exp_str_all)
+            sign_str + left_str + "." + right_str + exp_str_all)
 
 @composite
 def random_complex(draw, base: Base) -> tuple[RkExactComplex, str]:
@@ -86,6 +96,33 @@ def random_complex(draw, base: Base) -> tuple[RkExactComplex, str]:
     sign = "" if imag_str.startswith("-") else "+"
     return value, real_str + sign + imag_str + i
 
+@composite
+def random_literal(draw) -> str:
+    base = draw(st.sampled_from(list(Base)))
+    prefix = draw(st.sampled_from(exact_prefixes(base)))
+    _, numeral = draw(st.one_of(
+        random_signed_int(base),
+        random_rational(base),
+        random_floating_point(base),
+        random_complex(base),
+    ))
+    return prefix + numeral
+
+@composite
+def random_inexact_literal(draw) -> str:
+    base = draw(st.sampled_from(list(Base)))
+    return draw(st.sampled_from(inexact_prefixes(base))) + draw(random_literal_numeral(base))
+
+@composite
+def random_literal_numeral(draw, base: Base) -> str:
+    _, numeral = draw(st.one_of(
+        random_signed_int(base),
+        random_rational(base),
+        random_floating_point(base),
+        random_complex(base),
+    ))
+    return numeral
+
 
 EXACT = ["", "#e", "#E"]
 DECIMAL = ["", "#d", "#D"]
@@ -0,0 +1,40 @@
+import pytest
+from hypothesis import given
+from lark.exceptions import LarkError
+
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.fastnum import parse_number
+from . import random_literal
+
+
+class TestFastnum:
+    p = PyracketParser(start="number")
+
+    def assert_same_as_lark(self, text: str) -> None:
+        fast = parse_number(text)
+        slow = self.p.parse(text)
+        assert type(fast) is type(slow)
+        assert fast.value == slow.value
+        for attr in ("line", "column", "end_line", "end_column",
+                     "start_pos", "end_pos"):
+            assert getattr(fast.meta, attr) == getattr(slow.meta, attr)
+
+    @given(random_literal())
+    def test_matches_lark(self, text):
+        self.assert_same_as_lark(text)
+
+    @pytest.mark.parametrize("text", [
+        "+i", "-I", "#x+i", "1-i", "#e#b-1/10+.1i", "#X#E1.s-10", "1.e5",
+        "-.5d-3", "#d#e+0/1", "#x1.e5", "#i1.5", "#x#i-a/2+ai", "#i-inf.0-i",
+    ])
+    def test_edge_cases(self, text):
+        self.assert_same_as_lark(text)
+
+    @pytest.mark.parametrize("text", [
+        "", "#e", "+", "1/0", "#e#e1", "#b#x1", "#b2", "1e5",
+        "1 ", "1+2", "1i", "#i#e1.5", "1//2",
+    ])
+    def test_falls_back(self, text):
+        assert parse_number(text) is None
+        with pytest.raises((LarkError, ValueError)):
+            self.p.parse_ast(text)
@@ -1,4 +1,5 @@
 from decimal import Decimal
+from fractions import Fraction
 from typing import Tuple
 
 from hypothesis import given, strategies as st
@@ -63,9 +64,11 @@ class TestFloatingPoint(ParserTestBase):
             RkExactFloatingPoint(base, pos_or_neg, digits, exponent),
             0, len(to_parse)
         )
-        assert (result.value.dec() == Decimal(mult)
-                * Decimal(int(digits, base.value))
-                * Decimal(base.value) ** Decimal(exponent.value))
+        # dec() is exact, so compare exactly rather than under the
+        # context's precision
+        assert (Fraction(result.value.dec()) == mult
+                * int(digits, base.value)
+                * Fraction(base.value) ** exponent.value)
 
     @given(
         st.sampled_from(exact_prefixes(Base.BINARY)),
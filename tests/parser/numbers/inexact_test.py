@@ -0,0 +1,130 @@
+import math
+from fractions import Fraction
+
+import pytest
+from hypothesis import given, strategies as st
+
+from pyracket.semantics.numbers import BASE_TO_ALPH, Base, RkInexactComplex, \
+    RkInexactReal
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.expr_ast import InexactComplexAst, InexactRealAst
+from pyracket.syntax.fastnum import parse_number
+from tests.parser.ParserTestBase import ParserTestBase
+from tests.parser.numbers import inexact_prefixes, random_inexact_literal
+
+DIGIT_FORMATS = {Base.BINARY: "b", Base.OCTAL: "o", Base.DECIMAL: "d",
+                 Base.HEXADECIMAL: "x"}
+
+
+def nearest_float(value: Fraction) -> float:
+    """The correctly rounded float, by way of int division."""
+    try:
+        return value.numerator / value.denominator
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+class TestInexact(ParserTestBase):
+    p = PyracketParser(start="number")
+
+    def assert_both(self, text: str, cls, value) -> None:
+        self.assert_parse_equal(text, cls, value, 0, len(text))
+        fast = parse_number(text)
+        assert isinstance(fast, cls)
+        assert fast.value == value
+
+    @given(st.sampled_from(inexact_prefixes(Base.DECIMAL)),
+           st.floats(allow_nan=False))
+    def test_decimal_round_trip(self, prefix: str, f: float):
+        text = repr(f)
+        if "inf" in text:
+            text = "+inf.0" if f > 0 else "-inf.0"
+        elif "." not in text:
+            # repr gives 1e+16, which needs a point here
+            mantissa, exp = text.split("e")
+            text = f"{mantissa}.e{exp}"
+        self.assert_both(prefix + text, InexactRealAst, RkInexactReal(f))
+
+    @given(st.sampled_from(list(Base)), st.integers(0, 10 ** 40),
+           st.integers(-400, 400), st.sampled_from(["", "-"]))
+    def test_correctly_rounded(self, base: Base, digits: int, exp: int,
+                               sign: str):
+        marks = "s" if base is Base.HEXADECIMAL else "e"
+        exp_digits = format(abs(exp), DIGIT_FORMATS[base])
+        text = (f"{inexact_prefixes(base)[0]}{sign}"
+                f"{format(digits, DIGIT_FORMATS[base])}."
+                f"{marks}{'-' if exp < 0 else ''}{exp_digits}")
+        exact = digits * Fraction(base.value) ** exp
+        expected = nearest_float(exact)
+        self.assert_both(text, InexactRealAst,
+                         RkInexactReal(-expected if sign else expected))
+
+    @given(st.sampled_from(list(Base)), st.integers(-10 ** 30, 10 ** 30),
+           st.integers(1, 10 ** 30))
+    def test_rationals(self, base: Base, num: int, den: int):
+        fmt = DIGIT_FORMATS[base]
+        text = (f"{inexact_prefixes(base)[-1]}{'-' if num < 0 else ''}"
+                f"{format(abs(num), fmt)}/{format(den, fmt)}")
+        self.assert_both(text, InexactRealAst,
+                         RkInexactReal(nearest_float(Fraction(num, den))))
+
+    @given(random_inexact_literal())
+    def test_fastnum_matches_lark(self, text):
+        fast = parse_number(text)
+        slow = self.p.parse(text)
+        assert type(fast) is type(slow)
+        assert fast.value == slow.value
+
+    @pytest.mark.parametrize("text, value", [
+        ("+inf.0", math.inf),
+        ("-inf.0", -math.inf),
+        ("+INF.f", math.inf),
+        ("+nan.0", math.nan),
+        ("-nan.0", math.nan),
+        ("#i+inf.0", math.inf),
+        ("#x#i-inf.0", -math.inf),
+        ("#i-0", -0.0),
+        ("#i0", 0.0),
+        ("#I#B-.0", -0.0),
+        ("#i1.e400", math.inf),
+        ("#i1.e-400", 0.0),
+        ("#b#i1.1", 1.5),
+        ("#o#i-7.7s2", -504.0),
+        ("#i#x10/8", 2.0),
+        ("#i1/3", 1 / 3),
+    ])
+    def test_reals(self, text, value):
+        self.assert_both(text, InexactRealAst, RkInexactReal(value))
+
+    @pytest.mark.parametrize("text, real, imag", [
+        ("#i1+2i", 1.0, 2.0),
+        ("#i+i", 0.0, 1.0),
+        ("#i-i", 0.0, -1.0),
+        ("#i-0-0i", -0.0, -0.0),
+        ("#x#i-inf.0+a/4i", -math.inf, 2.5),
+        ("#i+nan.0-1.5i", math.nan, -1.5),
+    ])
+    def test_complexes(self, text, real, imag):
+        self.assert_both(text, InexactComplexAst,
+                         RkInexactComplex(real, imag))
+
+    def test_signed_zeros_differ(self):
+        assert RkInexactReal(0.0) != RkInexactReal(-0.0)
+        assert len({RkInexactReal(0.0), RkInexactReal(-0.0),
+                    RkInexactReal(math.nan), RkInexactReal(-math.nan)}) == 3
+
+    @pytest.mark.parametrize("text", [
+        "#e+inf.0", "#x+inf.0", "+inf.1", "#i#e1", "#i", "#i+inf.0i",
+    ])
+    def test_rejects(self, text):
+        assert parse_number(text) is None
+        with pytest.raises(Exception):
+            self.p.parse_ast(text)
+
+    def test_in_file(self):
+        p = PyracketParser(start="file")
+        forms = p.parse_ast('#i1+inf.0"a"#b#i1-nan.0')
+        assert [type(f) for f in forms] == [
+            InexactRealAst, InexactRealAst, type(forms[2]),
+            InexactRealAst, InexactRealAst]
+        assert forms[1].meta.start_pos == 3
@@ -0,0 +1,90 @@
+import multiprocessing
+
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.parse_cache import SUFFIX, ParseCache
+from pyracket.syntax.span import Span
+
+TEXT = '#true"a\nb"12#x-1/2#e-1.5#b1+i'
+
+
+def parse_in(directory):
+    cache = ParseCache(PyracketParser(start="file"), directory)
+    return [form.value for form in cache.parse_ast(TEXT)]
+
+
+class TestParseCache:
+    p = PyracketParser(start=["file", "number"])
+
+    def test_memory_hits(self):
+        cache = ParseCache(self.p)
+        first = cache.parse_ast(TEXT, start="file")
+        second = cache.parse_ast(TEXT, start="file")
+        assert second == first
+        assert second is not first
+        assert all(isinstance(form.meta, Span) for form in second)
+        assert second[1].meta.end_line == 2
+        number = cache.parse_ast("#x-ff", start="number")
+        assert cache.parse_ast("#x-ff", start="number") == number
+        assert (cache.stats.memory_hits, cache.stats.misses) == (2, 2)
+
+    def test_keyed_by_start(self):
+        cache = ParseCache(self.p)
+        assert cache.key("1", "file") != cache.key("1", "number")
+        assert isinstance(cache.parse_ast("1", start="file"), list)
+        assert not isinstance(cache.parse_ast("1", start="number"), list)
+        assert cache.stats.misses == 2
+
+    def test_disk_hits(self, tmp_path):
+        ParseCache(self.p, tmp_path).parse_ast(TEXT, start="file")
+        cache = ParseCache(self.p, tmp_path)
+        assert cache.parse_ast(TEXT, start="file") == self.p.parse_ast(
+            TEXT, start="file")
+        assert cache.parse_ast(TEXT, start="file")
+        assert cache.stats == type(cache.stats)(1, 1, 0)
+        assert cache.stats.hits == 2
+
+    def test_memory_is_bounded(self):
+        cache = ParseCache(self.p, memory_entries=2)
+        for text in ("1", "2", "3", "1"):
+            cache.parse_ast(text, start="file")
+        assert cache.stats.misses == 4
+        assert len(cache.memory) == 2
+
+    def test_eviction(self, tmp_path):
+        cache = ParseCache(self.p, tmp_path, max_disk_bytes=2000)
+        for i in range(40):
+            cache.parse_ast(f'"{i}"{i}', start="file")
+        sizes = [path.stat().st_size for path in tmp_path.glob(f"*/*{SUFFIX}")]
+        assert 0 < sum(sizes) <= 2000
+        assert len(sizes) < 40
+        assert cache.disk_bytes == sum(sizes)
+        # the latest entry is kept
+        cache.clear_memory()
+        cache.parse_ast('"39"39', start="file")
+        assert cache.stats.disk_hits == 1
+
+    def test_bad_file_is_a_miss(self, tmp_path):
+        cache = ParseCache(self.p, tmp_path)
+        cache.parse_ast(TEXT, start="file")
+        path = cache.path_of(cache.key(TEXT, "file"))
+        path.write_bytes(path.read_bytes()[:-3])
+        cache.clear_memory()
+        assert cache.parse_ast(TEXT, start="file")
+        assert cache.stats.misses == 2
+        cache.clear_memory()
+        cache.parse_ast(TEXT, start="file")
+        assert cache.stats.disk_hits == 1
+
+    def test_parse_path(self, tmp_path):
+        source = tmp_path / "a.rkt"
+        source.write_text(TEXT, encoding="utf-8")
+        cache = ParseCache(self.p, tmp_path / "cache")
+        assert cache.parse_path(source) == cache.parse_path(source)
+        assert cache.stats.hits == 1
+
+    def test_processes_share_directory(self, tmp_path):
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(parse_in, [tmp_path] * 4)
+        assert all(result == results[0] for result in results)
+        assert len(list(tmp_path.glob(f"*/*{SUFFIX}"))) == 1
+        assert not list(tmp_path.glob("*/*.tmp"))
@@ -0,0 +1,50 @@
+import pytest
+
+from pyracket.semantics.numbers import Base, RkInteger
+from pyracket.syntax import parse_many
+from pyracket.syntax.expr_ast import BooleanAst, IntegerAst, StringAst
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"good{i}.rkt"
+        path.write_text(f'#true"{i}"{i}', encoding="utf-8")
+        paths.append(path)
+    bad = tmp_path / "bad.rkt"
+    bad.write_text('#true"x\n"?', encoding="utf-8")
+    paths.insert(7, bad)
+    paths.insert(20, tmp_path / "missing.rkt")
+    return paths
+
+
+class TestParseMany:
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_in_order(self, files, workers):
+        results = list(parse_many(files, workers=workers, chunksize=3))
+        assert [r.path for r in results] == [str(path) for path in files]
+        good = [r for r in results if r.error is None]
+        assert len(good) == 40
+        for i, result in enumerate(good):
+            boolean, string, integer = result.forms
+            assert isinstance(boolean, BooleanAst) and boolean.value
+            assert isinstance(string, StringAst) and string.value == str(i)
+            assert isinstance(integer, IntegerAst)
+            assert integer.value == RkInteger(Base.DECIMAL, i)
+            assert integer.meta.start_pos == len(str(i)) + 7
+
+    def test_errors_do_not_stop_batch(self, files):
+        results = {r.path: r for r in parse_many(files, workers=2)}
+        bad = results[str(files[7])]
+        assert bad.forms is None
+        assert (bad.line, bad.column) == (2, 2)
+        missing = results[str(files[20])]
+        assert missing.forms is None
+        assert missing.error.startswith("FileNotFoundError")
+        assert sum(r.error is None for r in results.values()) == 40
+
+    def test_unordered(self, files):
+        results = list(parse_many(files, workers=2, ordered=False))
+        assert sorted(r.path for r in results) == sorted(map(str, files))
@@ -0,0 +1,89 @@
+import pytest
+from hypothesis import assume, given, strategies as st
+from lark.exceptions import LarkError
+
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.incremental import edit_window
+from tests.parser.iter_file_test import META_ATTRS, random_form
+
+
+def apply_edits(text: str, edits) -> str:
+    for offset, deleted, inserted in edits:
+        text = text[:offset] + inserted + text[offset + deleted:]
+    return text
+
+@st.composite
+def random_edits(draw, text: str):
+    edits = []
+    for _ in range(draw(st.integers(1, 3))):
+        offset = draw(st.integers(0, len(text)))
+        deleted = draw(st.integers(0, len(text) - offset))
+        inserted = draw(st.one_of(
+            random_form, st.text(alphabet='#"\\\n1/.+tei', max_size=3)))
+        edits.append((offset, deleted, inserted))
+        text = apply_edits(text, edits[-1:])
+    return edits
+
+texts_and_edits = st.lists(random_form, max_size=8).map("".join).flatmap(
+    lambda text: st.tuples(st.just(text), random_edits(text)))
+
+
+class TestReparse:
+    p = PyracketParser(start="file")
+
+    def assert_same_forms(self, actual, expected):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert type(a) is type(e)
+            assert a.value == e.value
+            for attr in META_ATTRS:
+                assert getattr(a.meta, attr) == getattr(e.meta, attr), attr
+
+    @given(texts_and_edits)
+    def test_matches_full_parse(self, text_and_edits):
+        text, edits = text_and_edits
+        try:
+            forms = self.p.parse_ast(text)
+        except (LarkError, ValueError):
+            # concatenated literals can run together
+            assume(False)
+        new_text = apply_edits(text, edits)
+        try:
+            expected = self.p.parse_ast(new_text)
+        except (LarkError, ValueError):
+            with pytest.raises((LarkError, ValueError)):
+                self.p.reparse(forms, new_text, edits)
+            return
+        self.assert_same_forms(
+            self.p.reparse(forms, new_text, edits), expected)
+
+    def test_reuses_untouched_forms(self):
+        text = '#true"a\nb"12#x1f"c"#false'
+        forms = self.p.parse_ast(text)
+        old_forms = list(forms)
+        edits = [(10, 2, "345")]
+        new_text = apply_edits(text, edits)
+        new_forms = self.p.reparse(forms, new_text, edits)
+        assert new_forms is forms
+        assert new_forms[0] is old_forms[0]
+        assert new_forms[1] is old_forms[1]
+        assert new_forms[2].value.value == 345
+        assert all(a is b for a, b in zip(new_forms[3:], old_forms[3:]))
+        self.assert_same_forms(new_forms, self.p.parse_ast(new_text))
+
+    def test_merges_with_neighbour(self):
+        text = "12#true"
+        edits = [(2, 5, "3")]
+        new_forms = self.p.reparse(self.p.parse_ast(text), "123", edits)
+        assert [f.value.value for f in new_forms] == [123]
+
+    def test_no_edits(self):
+        forms = self.p.parse_ast("#true1")
+        assert self.p.reparse(forms, "#true1", []) == forms
+
+    def test_edit_window(self):
+        assert edit_window([]) is None
+        assert edit_window([(5, 2, "abc")]) == (5, 7, 8)
+        # the second edit is in new-text positions, after the first one
+        assert edit_window([(5, 2, "abc"), (10, 1, "")]) == (5, 10, 10)
+        assert edit_window([(5, 2, "abc"), (0, 1, "xy")]) == (0, 7, 9)
@@ -0,0 +1,76 @@
+import dataclasses
+
+import pytest
+from hypothesis import given, strategies as st
+
+from pyracket.semantics.numbers import Base, RkInteger
+from pyracket.syntax import PyracketParser
+from pyracket.syntax.span import LineIndex, Span
+from tests.parser.iter_file_test import META_ATTRS, random_form
+from tests.parser.reparse_test import apply_edits
+
+TEXT = '#true"a\nbc"12"\n\n"#x-1/2#e1.5+2i'
+
+multi_line_text = st.lists(random_form, max_size=8).map("".join)
+
+
+class TestSpan:
+    p = PyracketParser(start=["file", "number"])
+    spans = PyracketParser(start=["file", "number"], spans=True)
+
+    def assert_same_positions(self, with_spans, with_meta):
+        assert len(with_spans) == len(with_meta)
+        for s, m in zip(with_spans, with_meta):
+            assert isinstance(s.meta, Span)
+            assert s.value == m.value
+            for attr in META_ATTRS:
+                assert getattr(s.meta, attr) == getattr(m.meta, attr), attr
+
+    def test_nodes_are_slotted(self):
+        for form in self.spans.parse_ast(TEXT, start="file"):
+            assert not hasattr(form, "__dict__")
+            assert not hasattr(form.meta, "__dict__")
+            assert not hasattr(form.value, "__dict__")
+
+    def test_values_are_frozen(self):
+        value = RkInteger(Base.DECIMAL, 1)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            value.value = 2
+        assert hash(value) == hash(RkInteger(Base.DECIMAL, 1))
+
+    def test_same_positions_as_meta(self):
+        self.assert_same_positions(
+            self.spans.parse_ast(TEXT, start="file"),
+            self.p.parse_ast(TEXT, start="file"))
+        number = self.spans.parse_ast("#x-ff", start="number")
+        assert isinstance(number.meta, Span)
+        assert (number.meta.line, number.meta.end_column) == (1, 6)
+
+    def test_iter_file(self):
+        self.assert_same_positions(
+            list(self.spans.iter_file([TEXT[:7], TEXT[7:20], TEXT[20:]])),
+            self.p.parse_ast(TEXT, start="file"))
+
+    @given(multi_line_text, st.data())
+    def test_reparse(self, text, data):
+        try:
+            forms = self.spans.parse_ast(text, start="file")
+        except Exception:
+            return
+        offset = data.draw(st.integers(0, len(text)))
+        edits = [(offset, 0, data.draw(random_form))]
+        new_text = apply_edits(text, edits)
+        try:
+            expected = self.p.parse_ast(new_text, start="file")
+        except Exception:
+            return
+        self.assert_same_positions(
+            self.spans.reparse(forms, new_text, edits), expected)
+
+    def test_line_index(self):
+        lines = LineIndex("ab\nc\n\nd")
+        assert list(lines.starts) == [0, 3, 5, 6]
+        assert [lines.line_of(i) for i in range(7)] == [1, 1, 1, 2, 2, 3, 4]
+        assert lines.column_of(4) == 2
+        lines.reset("x\ny")
+        assert list(lines.starts) == [0, 2]
@@ -41,5 +41,20 @@ class TestString(ParserTestBase):
         to_parse = f'"{repr(s)[1:-1].replace('"', r'\"')}"'
         self.assert_parse_equal(to_parse, StringAst, s, 0, len(to_parse))
 
+    def test_unicode_pair(self):
+        self.assert_parse_equal(
+            r'"\uD83D\uDE00"', StringAst, "\U0001F600", 0, 14)
 
-    #TODO: test unicode pairs, etc
\ No newline at end of file
+    def test_lone_surrogate(self):
+        self.assert_parse_equal(r'"\uD83D"', StringAst, "\ud83d", 0, 8)
+
+    def test_long_unicode(self):
+        self.assert_parse_equal(r'"\U1F600!"', StringAst, "\U0001F600!", 0, 10)
+
+    def test_short_escapes(self):
+        self.assert_parse_equal(
+            r'"\a\b\e\f\n\r\t\v\'\\"', StringAst,
+            "\a\b\033\f\n\r\t\v'\\", 0, 22)
+
+    def test_octal_and_hex_lengths(self):
+        self.assert_parse_equal(r'"\1011\x41F"', StringAst, "A1AF", 0, 12)
\ No newline at end of file
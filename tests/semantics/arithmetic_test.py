@@ -0,0 +1,203 @@
+import math
+from fractions import Fraction
+
+import pytest
+from hypothesis import given, strategies as st
+
+from pyracket.semantics.arithmetic import add, denominator, div, \
+    exact_to_inexact, expt, gcd, ge, gt, inexact_to_exact, integer, lcm, le, \
+    lt, modulo, mul, num_eq, numerator, quotient, ratio, remainder, sub
+from pyracket.semantics.numbers import Base, PosOrNeg, RkExactComplex, \
+    RkExactFloatingPoint, RkInexactComplex, RkInexactReal, RkInteger, \
+    RkRational
+
+D = Base.DECIMAL
+
+
+def rational(num, den):
+    return RkRational(D, num, den)
+
+def fraction_of(n):
+    return Fraction(*ratio(n))
+
+ints = st.integers(-10 ** 30, 10 ** 30)
+small = st.integers(-300, 300)
+nonzero = ints.filter(bool)
+
+@st.composite
+def exact_reals(draw):
+    kind = draw(st.sampled_from(["int", "rational", "float"]))
+    base = draw(st.sampled_from(list(Base)))
+    if kind == "int":
+        return RkInteger(base, draw(ints))
+    elif kind == "rational":
+        return RkRational(base, draw(ints), draw(nonzero))
+    digits = format(draw(st.integers(0, 10 ** 6)), "x" if base is
+                    Base.HEXADECIMAL else "d" if base is Base.DECIMAL else
+                    "o" if base is Base.OCTAL else "b")
+    return RkExactFloatingPoint(
+        base, draw(st.sampled_from(PosOrNeg)), digits,
+        RkInteger(base, draw(st.integers(-5, 5))))
+
+
+class TestArithmetic:
+
+    def assert_normalised(self, n, expected: Fraction):
+        assert fraction_of(n) == expected
+        if expected.denominator == 1:
+            assert type(n) is RkInteger
+        else:
+            assert type(n) is RkRational
+            assert (n.numerator, n.denominator) == (
+                expected.numerator, expected.denominator)
+        assert n.base is D
+
+    @given(exact_reals(), exact_reals(), exact_reals())
+    def test_field_ops_match_fraction(self, a, b, c):
+        fa, fb, fc = map(fraction_of, (a, b, c))
+        self.assert_normalised(add(a, b, c), fa + fb + fc)
+        self.assert_normalised(sub(a, b, c), fa - fb - fc)
+        self.assert_normalised(sub(a), -fa)
+        self.assert_normalised(mul(a, b, c), fa * fb * fc)
+        if fb and fc:
+            self.assert_normalised(div(a, b, c), fa / fb / fc)
+        assert lt(a, b) == (fa < fb)
+        assert le(a, b, c) == (fa <= fb <= fc)
+        assert gt(a, b) == (fa > fb)
+        assert ge(c, b) == (fc >= fb)
+        assert num_eq(a, b) == (fa == fb)
+
+    def test_demotes_and_ignores_bases(self):
+        assert add(rational(1, 2), rational(1, 2)) == integer(1)
+        assert mul(rational(2, 3), integer(3)) == integer(2)
+        assert num_eq(RkInteger(Base.HEXADECIMAL, 16), integer(16))
+        assert RkInteger(Base.HEXADECIMAL, 16) != integer(16)
+        half = RkExactFloatingPoint(D, PosOrNeg.POS, "05", integer(-1))
+        assert add(half, half) == integer(1)
+        assert numerator(rational(4, 6)) == integer(2)
+        assert denominator(rational(4, 6)) == integer(3)
+        assert denominator(integer(5)) == integer(1)
+
+    def test_small_integers_are_shared(self):
+        assert add(integer(2), integer(3)) is integer(5)
+        assert add(integer(10 ** 20), integer(1)).value == 10 ** 20 + 1
+
+    def test_complex(self):
+        i = RkExactComplex(integer(0), integer(1))
+        one_plus_i = RkExactComplex(integer(1), integer(1))
+        assert mul(i, i) == integer(-1)
+        assert add(one_plus_i, sub(i)) == integer(1)
+        assert div(integer(1), one_plus_i) == RkExactComplex(
+            rational(1, 2), rational(-1, 2))
+        assert mul(one_plus_i, div(integer(1), one_plus_i)) == integer(1)
+        assert expt(i, integer(4)) == integer(1)
+        assert num_eq(one_plus_i, RkExactComplex(integer(1), rational(2, 2)))
+        with pytest.raises(TypeError):
+            lt(i, integer(1))
+
+    def test_division_by_zero(self):
+        with pytest.raises(ZeroDivisionError):
+            div(integer(1), integer(0))
+        with pytest.raises(ZeroDivisionError):
+            div(rational(0, 3))
+        with pytest.raises(ZeroDivisionError):
+            quotient(integer(1), integer(0))
+        with pytest.raises(ZeroDivisionError):
+            expt(integer(0), integer(-1))
+
+    @given(ints, nonzero)
+    def test_integer_division(self, a, b):
+        q, r = quotient(integer(a), integer(b)), remainder(integer(a), integer(b))
+        assert q.value * b + r.value == a
+        assert abs(r.value) < abs(b)
+        assert r.value == 0 or (r.value < 0) == (a < 0)
+        m = modulo(integer(a), integer(b))
+        assert m.value == a % b
+
+    def test_integer_division_needs_integers(self):
+        assert quotient(rational(8, 2), integer(3)) == integer(1)
+        with pytest.raises(TypeError):
+            modulo(rational(1, 2), integer(3))
+
+    @given(exact_reals(), st.integers(-20, 20))
+    def test_expt_integer_powers(self, a, k):
+        fa = fraction_of(a)
+        if fa == 0 and k < 0:
+            return
+        self.assert_normalised(expt(a, integer(k)), fa ** k)
+
+    def test_expt_fractional_powers(self):
+        assert expt(integer(4), rational(1, 2)) == integer(2)
+        assert expt(rational(8, 27), rational(-2, 3)) == rational(9, 4)
+        with pytest.raises(ValueError):
+            expt(integer(2), rational(1, 2))
+        with pytest.raises(ValueError):
+            expt(integer(-4), rational(1, 2))
+
+    @given(st.lists(small, max_size=5))
+    def test_gcd_lcm_integers(self, values):
+        import math
+        numbers = [integer(v) for v in values]
+        assert gcd(*numbers) == integer(math.gcd(*values))
+        assert lcm(*numbers) == integer(math.lcm(*values))
+
+    def test_gcd_lcm_rationals(self):
+        assert gcd(rational(1, 2), rational(1, 3)) == rational(1, 6)
+        assert lcm(rational(1, 2), rational(1, 3)) == integer(1)
+        assert gcd() == integer(0)
+        assert lcm() == integer(1)
+
+
+def nearest_float(value: Fraction) -> float:
+    try:
+        return value.numerator / value.denominator
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+class TestConversions:
+
+    @given(exact_reals())
+    def test_exact_to_inexact_rounds_correctly(self, n):
+        assert exact_to_inexact(n) == RkInexactReal(
+            nearest_float(fraction_of(n)))
+
+    @given(st.sampled_from([Base.BINARY, Base.OCTAL, Base.HEXADECIMAL]),
+           st.integers(1, 10 ** 20), st.integers(-2000, 2000))
+    def test_extreme_exponents(self, base, digits, exp):
+        n = RkExactFloatingPoint(
+            base, PosOrNeg.NEG, format(digits, "x"), RkInteger(base, exp)) \
+            if base is Base.HEXADECIMAL else RkExactFloatingPoint(
+                base, PosOrNeg.NEG, format(digits, "o" if base is Base.OCTAL
+                                           else "b"), RkInteger(base, exp))
+        expected = -nearest_float(fraction_of(n).__abs__())
+        assert exact_to_inexact(n) == RkInexactReal(expected)
+
+    def test_exact_to_inexact_limits(self):
+        huge = RkExactFloatingPoint(
+            Base.HEXADECIMAL, PosOrNeg.NEG, "1", RkInteger(Base.HEXADECIMAL,
+                                                           10 ** 12))
+        assert exact_to_inexact(huge) == RkInexactReal(-math.inf)
+        tiny = RkExactFloatingPoint(
+            Base.BINARY, PosOrNeg.NEG, "1", RkInteger(Base.BINARY, -10 ** 12))
+        assert exact_to_inexact(tiny) == RkInexactReal(-0.0)
+        assert exact_to_inexact(integer(10 ** 400)) == RkInexactReal(math.inf)
+        assert exact_to_inexact(RkExactComplex(
+            rational(1, 4), integer(-3))) == RkInexactComplex(0.25, -3.0)
+
+    @given(st.floats(allow_nan=False, allow_infinity=False))
+    def test_round_trip(self, f):
+        exact = inexact_to_exact(RkInexactReal(f))
+        assert fraction_of(exact) == Fraction(f)
+        assert exact_to_inexact(exact) == RkInexactReal(abs(f) if f == 0
+                                                        else f)
+
+    def test_inexact_to_exact(self):
+        assert inexact_to_exact(RkInexactReal(0.5)) == rational(1, 2)
+        assert inexact_to_exact(RkInexactReal(-3.0)) == integer(-3)
+        assert inexact_to_exact(RkInexactComplex(1.5, 0.0)) == rational(3, 2)
+        assert inexact_to_exact(RkInexactComplex(0.0, -2.0)) == \
+            RkExactComplex(integer(0), integer(-2))
+        for value in (math.inf, -math.inf, math.nan):
+            with pytest.raises(ValueError):
+                inexact_to_exact(RkInexactReal(value))
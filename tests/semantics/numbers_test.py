@@ -0,0 +1,67 @@
+import decimal
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+from hypothesis import given, strategies as st
+
+from pyracket.semantics.numbers import Base, PosOrNeg, RkExactFloatingPoint, \
+    RkInteger
+
+DIGIT_FORMATS = {Base.BINARY: "b", Base.OCTAL: "o", Base.DECIMAL: "d",
+                 Base.HEXADECIMAL: "x"}
+
+
+@st.composite
+def floating_points(draw):
+    base = draw(st.sampled_from(list(Base)))
+    digits = format(draw(st.integers(0, 10 ** 40)), DIGIT_FORMATS[base])
+    return RkExactFloatingPoint(
+        base, draw(st.sampled_from(PosOrNeg)), digits,
+        RkInteger(base, draw(st.integers(-60, 60))))
+
+def exact_value(n):
+    value = (int(n.digits, n.base.value)
+             * Fraction(n.base.value) ** n.exponent.value)
+    return -value if n.sign is PosOrNeg.NEG else value
+
+
+class TestExactFloatingPoint:
+
+    @given(floating_points())
+    def test_exact_in_every_base(self, n):
+        assert Fraction(*n.as_integer_ratio()) == exact_value(n)
+        assert Fraction(n.dec()) == exact_value(n)
+
+    @given(floating_points())
+    def test_leaves_context_alone(self, n):
+        with decimal.localcontext(prec=5) as context:
+            exact = n.dec()
+            assert decimal.getcontext() is context
+            assert context.prec == 5
+            rounded = n.dec(decimal.Context(prec=3))
+            assert rounded == decimal.Context(prec=3).plus(exact)
+            assert not context.flags[decimal.Inexact]
+
+    def test_zero_is_cached(self):
+        zero = RkExactFloatingPoint(
+            Base.DECIMAL, PosOrNeg.POS, "000", RkInteger(Base.DECIMAL, -2))
+        assert zero.dec() is zero.dec()
+        assert zero.dec() == 0
+        negative = RkExactFloatingPoint(
+            Base.BINARY, PosOrNeg.NEG, "0", RkInteger(Base.BINARY, -1))
+        assert negative.dec().is_signed()
+
+    def test_threads_agree(self):
+        numbers = [RkExactFloatingPoint(
+            base, PosOrNeg.NEG, "1" * 50, RkInteger(base, -37))
+            for base in Base]
+
+        def convert(prec):
+            with decimal.localcontext(prec=prec):
+                return [n.dec() for n in numbers]
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(convert, range(1, 41)))
+        assert all(result == results[0] for result in results)
+        assert [Fraction(d) for d in results[0]] == list(
+            map(exact_value, numbers))